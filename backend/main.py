@@ -1,8 +1,10 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Response
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List, Optional
 from contextlib import asynccontextmanager
+import os
 import uvicorn
 from dotenv import load_dotenv
 
@@ -14,13 +16,37 @@ from services.ai_service import AIEnhancementService
 from services.chatbot_service import ChatbotService
 from services.movie_database_service import MovieDatabaseService
 from services.firebase_service import FirebaseService
-from models.movie import MovieResponse, RecommendationRequest, RecommendationResponse
+from services.user_profiles import UserProfileCache
+from services.pagination import CursorError
+from models.movie import (
+    MovieResponse, RecommendationRequest, RecommendationResponse,
+    BatchRecommendationRequest, BatchRecommendationResponse,
+    MultiSeedRecommendationRequest, MultiSeedRecommendationResponse
+)
 
 # Initialize recommendation engine
 recommendation_engine = RecommendationEngine()
 firebase_service = None  # Initialize lazily to avoid blocking startup
 is_model_ready = False
-api_cache = {}  # Simple in-memory cache
+api_cache = {}  # Simple in-memory cache, keys are scoped to the model version
+user_profiles = UserProfileCache()  # LRU cache of per-user profile vectors
+# Serve movie listings from per-movie JSON encoded once per model version;
+# set to false to go through MovieResponse validation again (for debugging)
+preserialized_json = os.getenv('PRESERIALIZED_JSON', 'true').lower() == 'true'
+
+def versioned_cache_key(key: str) -> str:
+    """Cache key scoped to the model version currently being served"""
+    return f"{recommendation_engine.model_version}:{key}"
+
+def prune_stale_cache():
+    """Drop cached responses computed by older model versions"""
+    prefix = f"{recommendation_engine.model_version}:"
+    # Request handlers keep inserting while this runs on the background thread,
+    # so iterate over a snapshot of the keys
+    for key in list(api_cache):
+        if not key.startswith(prefix):
+            api_cache.pop(key, None)
+    user_profiles.clear()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -39,22 +65,63 @@ async def lifespan(app: FastAPI):
     
     print("✓ Application startup complete!")
     
-    # Start ML model training in background (non-blocking)
+    # Warm start from persisted model artifacts (memory-mapped, no network calls)
     import threading
-    def load_model_background():
+    import time
+    max_age_hours = float(os.getenv('MODEL_MAX_AGE_HOURS', '24'))
+    refresh_interval_hours = float(os.getenv('MODEL_REFRESH_INTERVAL_HOURS', '0'))
+    if recommendation_engine.load_model():
+        is_model_ready = True
+        print("✓ ML model loaded from artifacts")
+    
+    def refresh_model():
         global is_model_ready
         try:
             print("Loading movie data and training model in background...")
-            recommendation_engine.load_data()
-            print("✓ Movie data loaded")
-            recommendation_engine.train_model()
-            print("✓ ML model trained")
+            # The new model is built off to the side and swapped in as one
+            # snapshot; in-flight requests finish on the snapshot they started with
+            if recommendation_engine.refresh():
+                prune_stale_cache()
+                is_model_ready = True
+                print("✓ Application startup complete!")
+        except Exception as e:
+            print(f"✗ Model training failed: {e}")
+    
+    def stream_model():
+        def on_publish():
+            global is_model_ready
+            prune_stale_cache()
             is_model_ready = True
+        
+        try:
+            print("Streaming movie data and training model in background...")
+            # Cold start: a partial model is served after the first few hundred
+            # movies and grows as the rest of the catalog streams in
+            recommendation_engine.stream_train(on_publish=on_publish)
+            try:
+                recommendation_engine.save_model()
+            except Exception as e:
+                print(f"✗ Saving model artifacts failed: {e}")
             print("✓ Application startup complete!")
         except Exception as e:
             print(f"✗ Model training failed: {e}")
     
-    threading.Thread(target=load_model_background, daemon=True).start()
+    def refresh_model_periodically(run_now: bool):
+        if run_now:
+            if is_model_ready:
+                refresh_model()
+            else:
+                stream_model()
+        while refresh_interval_hours > 0:
+            time.sleep(refresh_interval_hours * 3600)
+            refresh_model()
+    
+    # Train in the background (non-blocking) unless the artifact is fresh, then
+    # retrain every MODEL_REFRESH_INTERVAL_HOURS if set
+    artifact_age = recommendation_engine.artifact_age_hours()
+    run_now = not is_model_ready or artifact_age is None or artifact_age > max_age_hours
+    if run_now or refresh_interval_hours > 0:
+        threading.Thread(target=refresh_model_periodically, args=(run_now,), daemon=True).start()
     
     yield
 
@@ -72,6 +139,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # Cursor of the next page of movie listings
 )
 
 @app.get("/")
@@ -82,6 +150,32 @@ def read_root():
 def health_check():
     return {"status": "healthy"}
 
+@app.get("/ready")
+def readiness_check():
+    """
+    Readiness probe: 503 until a model (possibly a partial one) is being served
+    """
+    if not is_model_ready:
+        return JSONResponse(status_code=503, content={
+            "status": "loading",
+            "stage": recommendation_engine.progress.stage_name
+        })
+    return {"status": "ready", "model_version": recommendation_engine.model_version}
+
+@app.get("/api/status")
+def get_status():
+    """
+    Model version and catalog size plus the stage, movie count and per-stage
+    timings of the current or last catalog load
+    """
+    snapshot = recommendation_engine.snapshot
+    return {
+        "ready": is_model_ready,
+        "model_version": snapshot.model_version,
+        "movies_served": len(snapshot),
+        "ingestion": recommendation_engine.progress.to_dict()
+    }
+
 @app.post("/api/recommend", response_model=RecommendationResponse)
 async def get_recommendation(request: RecommendationRequest):
     """
@@ -98,7 +192,8 @@ async def get_recommendation(request: RecommendationRequest):
         )
     
     # Cache recommendations to prevent rate limiting loops
-    cache_key = f"rec_{request.movie_title}_{hash(str(request.user_preferences))}_{request.num_recommendations}"
+    ranking_weights = request.ranking_weights.model_dump(exclude_none=True) if request.ranking_weights else None
+    cache_key = versioned_cache_key(f"rec_{request.movie_title}_{hash(str(request.user_preferences))}_{request.num_recommendations}_{hash(str(ranking_weights))}_{request.diversity}")
     if cache_key in api_cache:
         return api_cache[cache_key]
     
@@ -106,32 +201,132 @@ async def get_recommendation(request: RecommendationRequest):
         recommendation = recommendation_engine.recommend(
             movie_title=request.movie_title,
             user_preferences=request.user_preferences,
-            num_recommendations=request.num_recommendations
+            num_recommendations=request.num_recommendations,
+            ranking_weights=ranking_weights,
+            diversity=request.diversity
         )
         api_cache[cache_key] = recommendation
         return recommendation
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/api/all-movies", response_model=List[MovieResponse])
-async def get_all_movies(
-    limit: int = 100,
-    search: Optional[str] = None
-):
+@app.post("/api/recommend/batch", response_model=BatchRecommendationResponse)
+async def get_batch_recommendations(request: BatchRecommendationRequest):
     """
-    Get all movies without date filtering (for onboarding and search)
+    Get recommendations for many movies in one request (e.g. a grid of movie cards)
     """
-    cache_key = f"all_movies_{limit}_{search or 'all'}"
+    if not is_model_ready:
+        return BatchRecommendationResponse(results=[
+            RecommendationResponse(
+                should_watch=True,
+                confidence=75.0,
+                reason="Model is still loading. This is a basic recommendation based on your preferences.",
+                recommended_movies=[],
+                target_movie=None
+            )
+            for _ in request.movie_titles
+        ])
+    
+    ranking_weights = request.ranking_weights.model_dump(exclude_none=True) if request.ranking_weights else None
+    cache_key = versioned_cache_key(f"rec_batch_{hash(tuple(request.movie_titles))}_{hash(str(request.user_preferences))}_{request.num_recommendations}_{hash(str(ranking_weights))}_{request.diversity}")
     if cache_key in api_cache:
         return api_cache[cache_key]
     
     try:
-        movies = recommendation_engine.get_all_movies(limit=limit, search=search)
-        api_cache[cache_key] = movies
-        return movies
+        results = recommendation_engine.recommend_batch(
+            movie_titles=request.movie_titles,
+            user_preferences=request.user_preferences,
+            num_recommendations=request.num_recommendations,
+            ranking_weights=ranking_weights,
+            diversity=request.diversity
+        )
+        response = BatchRecommendationResponse(results=results)
+        api_cache[cache_key] = response
+        return response
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/recommend/multi", response_model=MultiSeedRecommendationResponse)
+async def get_multi_seed_recommendations(request: MultiSeedRecommendationRequest):
+    """
+    Get "more like these" recommendations from several seed movies
+    """
+    if not is_model_ready:
+        return MultiSeedRecommendationResponse(seed_movies=[], recommended_movies=[])
+    
+    # Seed rows are only meaningful within one model snapshot
+    with recommendation_engine.pinned():
+        seeds = recommendation_engine.resolve_seeds(request.movie_titles, request.movie_ids)
+        if request.weights is not None and len(request.weights) != len(seeds):
+            raise HTTPException(status_code=400, detail="weights must have one entry per seed movie")
+        
+        try:
+            rows = [row for row in seeds if row is not None]
+            weights = None
+            if request.weights is not None:
+                weights = [weight for row, weight in zip(seeds, request.weights) if row is not None]
+            return MultiSeedRecommendationResponse(
+                seed_movies=recommendation_engine.catalog.to_responses(rows),
+                recommended_movies=recommendation_engine.recommend_from_seeds(
+                    rows,
+                    weights=weights,
+                    num_recommendations=request.num_recommendations,
+                    ranking_weights=request.ranking_weights.model_dump(exclude_none=True) if request.ranking_weights else None,
+                    diversity=request.diversity
+                )
+            )
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+def movie_listing(
+    listing: str,
+    response: Response,
+    limit: int,
+    search: Optional[str],
+    cursor: Optional[str]
+):
+    """
+    One page of a movie listing with its X-Next-Cursor header.
+    
+    Catalog rows are trusted, so by default the page is returned as JSON joined
+    from cached per-movie fragments, skipping MovieResponse construction and
+    response_model validation.
+    """
+    try:
+        if preserialized_json:
+            body, next_cursor = recommendation_engine.list_movies_json(
+                listing, limit=limit, search=search, cursor=cursor
+            )
+            # Returned as is, so the cursor header goes on this response
+            result = response = Response(content=body, media_type="application/json")
+        else:
+            result, next_cursor = recommendation_engine.list_movies(
+                listing, limit=limit, search=search, cursor=cursor
+            )
+    except CursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return result
+
+@app.get("/api/all-movies", response_model=List[MovieResponse])
+async def get_all_movies(
+    response: Response,
+    limit: int = Query(100, ge=1, le=5000),
+    search: Optional[str] = None,
+    cursor: Optional[str] = None
+):
+    """
+    Get all movies without date filtering (for onboarding and search)
+    
+    Pass the X-Next-Cursor header of a response as `cursor` to get the next
+    page; the header is absent on the last page.
+    """
+    return movie_listing('rating', response, limit, search, cursor)
+
 @app.get("/api/date-range")
 async def get_current_date_range():
     """
@@ -150,22 +345,18 @@ async def get_current_date_range():
 
 @app.get("/api/movies", response_model=List[MovieResponse])
 async def get_movies(
-    limit: int = 100,
-    search: Optional[str] = None
+    response: Response,
+    limit: int = Query(100, ge=1, le=5000),
+    search: Optional[str] = None,
+    cursor: Optional[str] = None
 ):
     """
     Get movies from comprehensive database (all movies for search/recommendations)
-    """
-    cache_key = f"movies_{limit}_{search or 'all'}"
-    if cache_key in api_cache:
-        return api_cache[cache_key]
     
-    try:
-        movies = recommendation_engine.get_movies(limit=limit, search=search)
-        api_cache[cache_key] = movies
-        return movies
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    Pass the X-Next-Cursor header of a response as `cursor` to get the next
+    page; the header is absent on the last page.
+    """
+    return movie_listing('rating_year', response, limit, search, cursor)
 
 @app.post("/api/movies/search-by-preferences", response_model=List[MovieResponse])
 async def search_movies_by_preferences(preferences: dict):
@@ -183,6 +374,31 @@ async def search_movies_by_preferences(preferences: dict):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/movies/ranked-for-preferences", response_model=List[MovieResponse])
+async def rank_movies_for_preferences(preferences: dict):
+    """
+    Rank the whole catalog against user preferences and return the top "should watch" movies
+    """
+    try:
+        limit = min(max(int(preferences.get('limit', 20)), 1), 100)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="limit must be an integer")
+    
+    try:
+        return recommendation_engine.rank_for_preferences(preferences, limit=limit)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/movies/autocomplete", response_model=List[MovieResponse])
+async def autocomplete_movies(q: str, limit: int = 10):
+    """
+    Autocomplete movie titles by prefix, ranked by rating and popularity
+    """
+    try:
+        return recommendation_engine.autocomplete(q, limit=min(max(limit, 1), 50))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.get("/api/movies/{movie_id}", response_model=MovieResponse)
 async def get_movie(movie_id: int):
     """
@@ -346,6 +562,7 @@ async def add_watch_history(user_id: str, movie_data: dict):
         raise HTTPException(status_code=503, detail="Firebase service not available")
     try:
         result = firebase_service.add_to_watch_history(user_id, movie_data)
+        user_profiles.invalidate(user_id)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -359,6 +576,7 @@ async def add_favorite(user_id: str, movie_id: str):
         raise HTTPException(status_code=503, detail="Firebase service not available")
     try:
         result = firebase_service.add_to_favorites(user_id, movie_id)
+        user_profiles.invalidate(user_id)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -372,6 +590,7 @@ async def remove_favorite(user_id: str, movie_id: str):
         raise HTTPException(status_code=503, detail="Firebase service not available")
     try:
         result = firebase_service.remove_from_favorites(user_id, movie_id)
+        user_profiles.invalidate(user_id)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -415,5 +634,51 @@ async def get_favorites(user_id: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/auth/user/{user_id}/favorites/recommendations", response_model=MultiSeedRecommendationResponse)
+async def get_favorites_recommendations(user_id: str, limit: int = 10):
+    """
+    Get recommendations based on all of the user's favorite movies
+    """
+    if not firebase_service:
+        raise HTTPException(status_code=503, detail="Firebase service not available")
+    if not is_model_ready:
+        return MultiSeedRecommendationResponse(seed_movies=[], recommended_movies=[])
+    try:
+        favorites = firebase_service.get_user_favorites(user_id)
+        with recommendation_engine.pinned():
+            rows = [row for row in recommendation_engine.resolve_seeds(movie_ids=favorites) if row is not None]
+            return MultiSeedRecommendationResponse(
+                seed_movies=recommendation_engine.catalog.to_responses(rows),
+                recommended_movies=recommendation_engine.recommend_from_seeds(
+                    rows, num_recommendations=min(max(limit, 1), 50)
+                )
+            )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/auth/user/{user_id}/for-you", response_model=List[MovieResponse])
+async def get_for_you(user_id: str, limit: int = 20):
+    """
+    Get personalized recommendations from the user's favorites and watch history
+    """
+    if not firebase_service:
+        raise HTTPException(status_code=503, detail="Firebase service not available")
+    if not is_model_ready:
+        return []
+    try:
+        engine = recommendation_engine
+        # The profile is built against, and must be scored with, one snapshot
+        with engine.pinned():
+            profile = user_profiles.get_profile(user_id, engine, firebase_service)
+            if profile is None:
+                return []
+            return engine.recommend_from_vector(
+                profile['vector'],
+                profile['seed_rows'],
+                num_recommendations=min(max(limit, 1), 50)
+            )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
@@ -24,6 +24,13 @@ class MovieResponse(BaseModel):
     similarity_score: Optional[float] = None
     mass_rating: Optional[float] = None
     cinephile_rating: Optional[float] = None
+    confidence: Optional[float] = None
+
+class RankingWeights(BaseModel):
+    similarity: Optional[float] = Field(default=None, ge=0, description="Weight of content similarity")
+    rating: Optional[float] = Field(default=None, ge=0, description="Weight of the Bayesian-smoothed rating")
+    popularity: Optional[float] = Field(default=None, ge=0, description="Weight of log popularity")
+    recency: Optional[float] = Field(default=None, ge=0, description="Weight of release recency")
 
 class RecommendationRequest(BaseModel):
     movie_title: str = Field(..., description="Title of the movie to get recommendations for")
@@ -32,6 +39,14 @@ class RecommendationRequest(BaseModel):
         description="User preferences including favorite_genres, min_rating, preferred_decade"
     )
     num_recommendations: int = Field(default=5, ge=1, le=20)
+    ranking_weights: Optional[RankingWeights] = Field(
+        default=None,
+        description="Per-request hybrid ranking weights; unset components use the server defaults"
+    )
+    diversity: float = Field(
+        default=0.0, ge=0, le=1,
+        description="MMR diversity: 0 keeps similarity order, higher values favour less similar picks"
+    )
 
 class RecommendationResponse(BaseModel):
     should_watch: bool
@@ -39,3 +54,31 @@ class RecommendationResponse(BaseModel):
     reason: str
     recommended_movies: List[MovieResponse]
     target_movie: Optional[MovieResponse]
+
+class BatchRecommendationRequest(BaseModel):
+    movie_titles: List[str] = Field(..., min_length=1, max_length=50, description="Titles to get recommendations for")
+    user_preferences: Dict = Field(
+        default={},
+        description="User preferences including favorite_genres, min_rating, preferred_decade"
+    )
+    num_recommendations: int = Field(default=5, ge=1, le=20)
+    ranking_weights: Optional[RankingWeights] = None
+    diversity: float = Field(default=0.0, ge=0, le=1)
+
+class BatchRecommendationResponse(BaseModel):
+    results: List[RecommendationResponse]
+
+class MultiSeedRecommendationRequest(BaseModel):
+    movie_titles: List[str] = Field(default=[], max_length=100, description="Seed movies by title")
+    movie_ids: List[int] = Field(default=[], max_length=100, description="Seed movies by ID")
+    weights: Optional[List[float]] = Field(
+        default=None,
+        description="Optional weight per seed, in the order movie_titles then movie_ids"
+    )
+    num_recommendations: int = Field(default=10, ge=1, le=50)
+    ranking_weights: Optional[RankingWeights] = None
+    diversity: float = Field(default=0.0, ge=0, le=1)
+
+class MultiSeedRecommendationResponse(BaseModel):
+    seed_movies: List[MovieResponse]
+    recommended_movies: List[MovieResponse]
@@ -0,0 +1,183 @@
+import numpy as np
+from typing import Optional, Tuple
+
+
+class LSHIndex:
+    """
+    Approximate nearest-neighbour index using random-projection (SimHash) LSH.
+
+    Every table hashes a row to the sign pattern of `n_bits` random hyperplanes,
+    so rows with a small angle between them tend to share buckets. A query only
+    scores the rows found in its buckets, which keeps lookups sub-linear in the
+    catalog size.
+
+    Recall/latency knobs:
+    - n_tables: more tables raise recall and memory linearly
+    - n_bits: more bits give smaller buckets, lowering latency and recall; when
+      unset it is derived from the catalog size so buckets hold ~bucket_size rows
+    - n_probes: also probe the buckets reached by flipping the n_probes least
+      confident bits of each table (multi-probe LSH)
+    - max_candidates: hard cap on the number of rows scored exactly per query
+    """
+
+    def __init__(
+        self,
+        n_tables: int = 8,
+        n_bits: Optional[int] = None,
+        n_probes: int = 2,
+        max_candidates: int = 2000,
+        bucket_size: int = 64,
+        seed: int = 42
+    ):
+        if n_bits is not None and not 1 <= n_bits <= 62:
+            raise ValueError("n_bits must be between 1 and 62")
+        self.n_tables = n_tables
+        self.n_bits = n_bits
+        self.n_probes = n_probes
+        self.max_candidates = max_candidates
+        self.bucket_size = bucket_size
+        self.seed = seed
+        self.matrix = None
+        self.planes = None
+        self.sorted_keys = []
+        self.sorted_rows = []
+        self._bit_weights = None
+
+    def _project(self, vectors) -> np.ndarray:
+        """Project rows onto all hyperplanes, shape (rows, n_tables, n_bits)"""
+        projected = vectors @ self.planes
+        projected = np.asarray(projected, dtype=np.float32)
+        return projected.reshape(-1, self.n_tables, self.n_bits)
+
+    def _hash(self, projected: np.ndarray) -> np.ndarray:
+        """Pack sign bits into one int64 bucket key per table, shape (rows, n_tables)"""
+        return (projected > 0).astype(np.int64) @ self._bit_weights
+
+    def fit(self, matrix, block_size: int = 8192) -> 'LSHIndex':
+        """Hash every row of `matrix` into the LSH tables"""
+        if self.n_bits is None:
+            self.n_bits = int(np.clip(np.round(np.log2(max(matrix.shape[0], 1) / self.bucket_size)), 4, 62))
+        self.n_probes = min(self.n_probes, self.n_bits)
+        self._bit_weights = (1 << np.arange(self.n_bits, dtype=np.int64))
+
+        rng = np.random.default_rng(self.seed)
+        self.matrix = matrix
+        self.planes = rng.standard_normal(
+            (matrix.shape[1], self.n_tables * self.n_bits)
+        ).astype(np.float32)
+
+        keys = np.empty((matrix.shape[0], self.n_tables), dtype=np.int64)
+        for start in range(0, matrix.shape[0], block_size):
+            end = min(start + block_size, matrix.shape[0])
+            keys[start:end] = self._hash(self._project(matrix[start:end]))
+
+        # Each table is a sorted key array plus the matching row ids (bucket = key range)
+        self.sorted_keys = []
+        self.sorted_rows = []
+        for table in range(self.n_tables):
+            order = np.argsort(keys[:, table], kind='stable').astype(np.int32)
+            self.sorted_keys.append(keys[order, table])
+            self.sorted_rows.append(order)
+
+        return self
+
+    def extend(self, matrix, block_size: int = 8192) -> 'LSHIndex':
+        """Hash the rows appended to `matrix` since the last fit/extend"""
+        start_row = self.matrix.shape[0]
+        self.matrix = matrix
+        if matrix.shape[0] == start_row:
+            return self
+
+        keys = np.empty((matrix.shape[0] - start_row, self.n_tables), dtype=np.int64)
+        for start in range(start_row, matrix.shape[0], block_size):
+            end = min(start + block_size, matrix.shape[0])
+            keys[start - start_row:end - start_row] = self._hash(self._project(matrix[start:end]))
+
+        # Rebind new lists rather than assigning into the old ones, so a shallow
+        # copy of the index taken before the update keeps serving the old tables
+        new_rows = np.arange(start_row, matrix.shape[0], dtype=np.int32)
+        sorted_keys, sorted_rows = [], []
+        for table in range(self.n_tables):
+            order = np.argsort(keys[:, table], kind='stable')
+            positions = np.searchsorted(self.sorted_keys[table], keys[order, table], side='right')
+            sorted_keys.append(np.insert(self.sorted_keys[table], positions, keys[order, table]))
+            sorted_rows.append(np.insert(self.sorted_rows[table], positions, new_rows[order]))
+        self.sorted_keys, self.sorted_rows = sorted_keys, sorted_rows
+
+        return self
+
+    def remap(self, matrix, old_to_new: np.ndarray) -> 'LSHIndex':
+        """Drop removed rows (mapped to -1) and renumber the remaining ones"""
+        self.matrix = matrix
+        sorted_keys, sorted_rows = [], []
+        for table in range(self.n_tables):
+            rows = old_to_new[self.sorted_rows[table]]
+            keep = rows >= 0
+            sorted_keys.append(self.sorted_keys[table][keep])
+            sorted_rows.append(rows[keep].astype(np.int32))
+        self.sorted_keys, self.sorted_rows = sorted_keys, sorted_rows
+        return self
+
+    def _probe_keys(self, projected_row: np.ndarray) -> np.ndarray:
+        """Bucket keys to probe for one query row, shape (n_tables, 1 + n_probes)"""
+        keys = self._hash(projected_row[None])[0]
+        if self.n_probes == 0:
+            return keys[:, None]
+
+        # Flip the bits whose hyperplanes the query lies closest to
+        weakest = np.argsort(np.abs(projected_row), axis=1)[:, :self.n_probes]
+        flipped = keys[:, None] ^ self._bit_weights[weakest]
+        return np.concatenate([keys[:, None], flipped], axis=1)
+
+    def candidates(self, projected_row: np.ndarray) -> np.ndarray:
+        """Collect the distinct rows sharing a probed bucket with the query"""
+        probe_keys = self._probe_keys(projected_row)
+        found = []
+        for table in range(self.n_tables):
+            table_keys = self.sorted_keys[table]
+            lo = np.searchsorted(table_keys, probe_keys[table], side='left')
+            hi = np.searchsorted(table_keys, probe_keys[table], side='right')
+            for start, end in zip(lo, hi):
+                if end > start:
+                    found.append(self.sorted_rows[table][start:end])
+
+        if not found:
+            return np.empty(0, dtype=np.int32)
+
+        rows, counts = np.unique(np.concatenate(found), return_counts=True)
+        if len(rows) > self.max_candidates:
+            # Keep the rows that collide with the query in the most buckets
+            keep = np.argpartition(-counts, self.max_candidates - 1)[:self.max_candidates]
+            rows = rows[keep]
+        return rows
+
+    def query(self, vectors, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Approximate top-k neighbours of each query row.
+
+        Same contract as `similarity.top_k_similar`: returns (indices, scores) of
+        shape (queries, k), best first, padded with -1 / -inf.
+        """
+        n_queries = vectors.shape[0]
+        out_idx = np.full((n_queries, k), -1, dtype=np.int32)
+        out_scores = np.full((n_queries, k), -np.inf, dtype=np.float32)
+        if k <= 0 or self.matrix is None:
+            return out_idx, out_scores
+
+        projected = self._project(vectors)
+        for row in range(n_queries):
+            cand = self.candidates(projected[row])
+            if len(cand) == 0:
+                continue
+
+            scores = self.matrix[cand] @ vectors[row].T
+            scores = scores.toarray() if hasattr(scores, 'toarray') else np.asarray(scores)
+            scores = scores.ravel().astype(np.float32)
+
+            top = min(k, len(cand))
+            part = np.argpartition(-scores, top - 1)[:top]
+            part = part[np.argsort(-scores[part], kind='stable')]
+            out_idx[row, :top] = cand[part]
+            out_scores[row, :top] = scores[part]
+
+        return out_idx, out_scores
@@ -0,0 +1,138 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Sequence
+
+from models.movie import MovieResponse
+from services.genres import canonical_genre, genre_mask, split_genres
+from services.json_fragments import MovieFragments
+
+
+def _frozen(array: np.ndarray) -> np.ndarray:
+    """Mark an array read-only so request handlers can share it safely"""
+    array.setflags(write=False)
+    return array
+
+
+def _intern(values: pd.Series) -> tuple:
+    """Category codes (int32) and the array of distinct values"""
+    codes, uniques = pd.factorize(values.fillna(''), sort=True)
+    return _frozen(codes.astype(np.int32)), _frozen(np.asarray(uniques, dtype=object))
+
+
+class MovieCatalog:
+    """
+    Immutable struct-of-arrays view of the movie catalog.
+
+    Numeric fields are NumPy arrays (id, rating, year, release month,
+    popularity, vote count) and repetitive strings (genres, industry, language)
+    are interned as int32 category codes into small tables of distinct values.
+    Genres are also encoded as uint32 bitmasks over the canonical genre table.
+    Endpoints address movies by row index arrays and only gather the rows they
+    return, so no request copies or iterates the whole catalog.
+    """
+
+    def __init__(self, movies_df: pd.DataFrame):
+        n_movies = len(movies_df)
+
+        def column(name: str, default, dtype) -> np.ndarray:
+            if name in movies_df.columns:
+                values = pd.to_numeric(movies_df[name], errors='coerce').fillna(default)
+                return _frozen(values.to_numpy(dtype=dtype))
+            return _frozen(np.full(n_movies, default, dtype=dtype))
+
+        self.ids = column('id', 0, np.int64)
+        self.ratings = column('rating', 0.0, np.float64)
+        self.years = column('year', 0, np.int32)
+        # 0 marks an unknown release month
+        self.months = column('release_month', 0, np.int8)
+        self.popularity = column('popularity', 0.0, np.float32)
+        self.vote_counts = column('vote_count', 0, np.int32)
+
+        self.titles = _frozen(movies_df['title'].fillna('').to_numpy(dtype=object))
+        self.descriptions = _frozen(movies_df['description'].fillna('').to_numpy(dtype=object))
+
+        self.genre_codes, self.genre_values = _intern(movies_df['genres'])
+        value_masks = np.array([genre_mask(v) for v in self.genre_values], dtype=np.uint32)
+        self.genre_masks = _frozen(value_masks[self.genre_codes])
+        # Genre values naming genres outside the canonical table (e.g. "Bollywood"),
+        # which the bitmasks cannot represent
+        self.genre_extra = _frozen(np.array([
+            any(canonical_genre(name) is None for name in split_genres(value))
+            for value in self.genre_values
+        ], dtype=bool))
+        empty = pd.Series([''] * n_movies, index=movies_df.index)
+        self.industry_codes, self.industry_values = _intern(movies_df.get('industry', empty))
+        self.language_codes, self.language_values = _intern(movies_df.get('language', empty))
+
+        # Presorted listing orders, computed once per catalog
+        self.by_rating = _frozen(np.argsort(-self.ratings, kind='stable').astype(np.int32))
+        self.by_rating_year = _frozen(np.lexsort((-self.years, -self.ratings)).astype(np.int32))
+
+        # Encoded JSON of the rows served so far, built on first use
+        self._fragments: Optional[MovieFragments] = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def genres(self, rows) -> np.ndarray:
+        """Genre strings of the given rows"""
+        return self.genre_values[self.genre_codes[rows]]
+
+    def movie(self, row: int) -> Dict:
+        """Plain dict with the core fields of one movie"""
+        month = int(self.months[row])
+        return {
+            'id': int(self.ids[row]),
+            'title': self.titles[row],
+            'genres': self.genre_values[self.genre_codes[row]],
+            'description': self.descriptions[row],
+            'rating': float(self.ratings[row]),
+            'year': int(self.years[row]),
+            'release_month': month if month > 0 else None,
+        }
+
+    def _columns(self, rows: Sequence[int]) -> Dict[str, List]:
+        """Gather the core fields of many rows as Python lists in one pass"""
+        rows = np.asarray(rows, dtype=np.int64)
+        months = self.months[rows].tolist()
+        return {
+            'id': self.ids[rows].tolist(),
+            'title': self.titles[rows].tolist(),
+            'genres': self.genre_values[self.genre_codes[rows]].tolist(),
+            'description': self.descriptions[rows].tolist(),
+            'rating': self.ratings[rows].tolist(),
+            'year': self.years[rows].tolist(),
+            'release_month': [m if m > 0 else None for m in months],
+        }
+
+    def to_dicts(self, rows: Sequence[int]) -> List[Dict]:
+        """Core fields of the given rows as dicts"""
+        columns = self._columns(rows)
+        keys = list(columns)
+        return [dict(zip(keys, values)) for values in zip(*columns.values())]
+
+    def to_responses(
+        self,
+        rows: Sequence[int],
+        reasons: Optional[Sequence[str]] = None,
+        similarity_scores: Optional[Sequence[float]] = None
+    ) -> List[MovieResponse]:
+        """MovieResponse objects for the given rows, in order"""
+        movies = []
+        for position, fields in enumerate(self.to_dicts(rows)):
+            if reasons is not None:
+                fields['reason'] = reasons[position]
+            if similarity_scores is not None:
+                fields['similarity_score'] = float(similarity_scores[position])
+            movies.append(MovieResponse(**fields))
+        return movies
+
+    def to_response(self, row: int, **extra) -> MovieResponse:
+        """MovieResponse for a single row"""
+        return MovieResponse(**self.movie(row), **extra)
+
+    def to_json(self, rows: Sequence[int]) -> bytes:
+        """JSON array of MovieResponses for the given rows, from cached fragments"""
+        if self._fragments is None:
+            self._fragments = MovieFragments(self)
+        return self._fragments.to_json(rows)
@@ -0,0 +1,240 @@
+import os
+import re
+import unicodedata
+import zlib
+import numpy as np
+from typing import Dict, Iterable, List, Optional, Tuple
+
+_NON_ALNUM = re.compile(r'[^0-9a-z]+')
+# Largest prime below 2**32: (a * h + b) mod p with 32-bit a, b and h is exact in uint64
+_PRIME = 4294967291
+
+# Words that say nothing about which film a description belongs to
+_STOP_WORDS = frozenset(
+    "a an and are as at be but by for from has he her his in into is it its of on or "
+    "she that the their they this to was were who whose will with".split()
+)
+
+
+def normalize_title(title: str) -> str:
+    """Lowercase ASCII title with punctuation and repeated spaces removed"""
+    title = unicodedata.normalize('NFKD', str(title or '')).encode('ascii', 'ignore').decode()
+    return _NON_ALNUM.sub(' ', title.lower().replace('&', ' and ')).strip()
+
+
+# Title words that number a film in a series, mapped to the number they stand for
+_ROMAN_NUMERALS = (
+    "i ii iii iv v vi vii viii ix x xi xii xiii xiv xv xvi xvii xviii xix xx".split()
+)
+_NUMBER_WORDS = (
+    "one two three four five six seven eight nine ten eleven twelve".split()
+)
+_ORDINAL_WORDS = (
+    "first second third fourth fifth sixth seventh eighth ninth tenth eleventh twelfth".split()
+)
+_SEQUEL_NUMBERS: Dict[str, str] = {}
+for _words in (_ROMAN_NUMERALS, _NUMBER_WORDS, _ORDINAL_WORDS):
+    _SEQUEL_NUMBERS.update({word: str(number) for number, word in enumerate(_words, start=1)})
+
+
+def sequel_numbers(title: str) -> frozenset:
+    """
+    Numbers in a normalized title, whether written as digits, roman numerals,
+    number words or ordinals ("saw ii" and "part two" both give {"2"})
+    """
+    numbers = set()
+    for token in title.split():
+        if token.isdigit():
+            numbers.add(str(int(token)))
+        elif token in _SEQUEL_NUMBERS:
+            numbers.add(_SEQUEL_NUMBERS[token])
+    return frozenset(numbers)
+
+
+def _year(value) -> Optional[int]:
+    try:
+        return int(str(value)[:4])
+    except (TypeError, ValueError):
+        return None
+
+
+def dedup_key(movie: Dict) -> Tuple[str, Optional[int]]:
+    """Exact-duplicate key of a movie: normalized title plus release year"""
+    return normalize_title(movie.get('title')), _year(movie.get('year'))
+
+
+def _title_shingles(movie: Dict) -> List[str]:
+    """Character trigrams of the normalized title"""
+    padded = f" {normalize_title(movie.get('title'))} "
+    return list({padded[i:i + 3] for i in range(max(len(padded) - 2, 1))})
+
+
+def _description_shingles(movie: Dict) -> List[str]:
+    """Content words of the description"""
+    words = normalize_title(movie.get('description')).split()
+    return list({word for word in words if word not in _STOP_WORDS})
+
+
+class MovieDeduplicator:
+    """
+    Streaming duplicate filter for movie records from several sources.
+
+    A record is a duplicate of an earlier one released at most a year before
+    or after it (both years must be known) whose title carries the same
+    numbers, including roman numerals, number words and ordinals, when either
+
+    - the normalized titles are equal (the same film listed a year apart by an
+      LLM and by TMDB), or
+    - the titles are near-identical, with an estimated similarity of at least
+      `title_threshold` (a differently spelled title), and the descriptions
+      agree with an estimated similarity of at least `threshold`.
+
+    A similar title alone is never enough, so sequels distinguished by a
+    subtitle ("The Purge" / "The Purge: Anarchy") stay apart. Records with
+    the same normalized title and year are always duplicates.
+
+    Similarities are MinHash estimates over title trigrams and description
+    words. Candidates are found by LSH banding of the title signatures: a
+    record is only compared with the few records it shares a band with, so
+    checking n records is O(n).
+
+    The first record seen wins, so sources should be fed in order of trust.
+    """
+
+    def __init__(
+        self,
+        threshold: Optional[float] = None,
+        title_threshold: Optional[float] = None,
+        num_perm: int = 64,
+        bands: int = 16,
+        seed: int = 42
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = (
+            threshold if threshold is not None
+            else float(os.getenv('DEDUP_SIMILARITY_THRESHOLD', '0.5'))
+        )
+        self.title_threshold = (
+            title_threshold if title_threshold is not None
+            else float(os.getenv('DEDUP_TITLE_THRESHOLD', '0.8'))
+        )
+        self.bands = bands
+        self.rows_per_band = num_perm // bands
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _PRIME, size=num_perm, dtype=np.uint64)
+        # Random odd multipliers folding each band of a signature into one bucket key
+        self._band_mix = rng.integers(1, 2 ** 63, size=self.rows_per_band, dtype=np.uint64) | np.uint64(1)
+
+        self._keys = set()
+        self._titles: Dict[str, List[int]] = {}
+        self._title_signatures: List[np.ndarray] = []
+        self._description_signatures: List[Optional[np.ndarray]] = []
+        self._years: List[Optional[int]] = []
+        self._numbers: List[frozenset] = []
+        self._title_buckets: List[Dict[int, List[int]]] = [{} for _ in range(bands)]
+
+    def _minhash(self, shingles: List[List[str]]) -> np.ndarray:
+        """MinHash signatures (one uint32 row per non-empty shingle set)"""
+        shingles = [row for row in shingles if row]
+        if not shingles:
+            return np.empty((0, len(self._a)), dtype=np.uint32)
+        counts = np.array([len(row) for row in shingles], dtype=np.int64)
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode()) for row in shingles for shingle in row),
+            dtype=np.uint64, count=int(counts.sum())
+        )
+        # All shingles of all movies are hashed at once (one row per permutation
+        # keeps the per-movie min-reduction contiguous)
+        mixed = self._a[:, None] * hashes + self._b[:, None]
+        mixed %= np.uint64(_PRIME)
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        return np.minimum.reduceat(mixed, starts, axis=1).T.astype(np.uint32)
+
+    def signatures(self, movies: List[Dict]) -> Tuple[np.ndarray, List[Optional[np.ndarray]]]:
+        """
+        MinHash signatures of the titles (one uint32 row per movie) and of the
+        descriptions (None for movies without a description)
+        """
+        titles = self._minhash([_title_shingles(movie) for movie in movies])
+        description_shingles = [_description_shingles(movie) for movie in movies]
+        described = iter(self._minhash(description_shingles))
+        descriptions = [next(described) if row else None for row in description_shingles]
+        return titles, descriptions
+
+    def band_keys(self, signatures: np.ndarray) -> List[List[int]]:
+        """LSH bucket key of every band of every signature"""
+        if len(signatures) == 0:
+            return []
+        bands = signatures.astype(np.uint64).reshape(len(signatures), self.bands, self.rows_per_band)
+        # uint64 arithmetic wraps; a rare key collision only costs one extra comparison
+        return (bands * self._band_mix).sum(axis=2, dtype=np.uint64).tolist()
+
+    def is_duplicate(self, movie: Dict) -> bool:
+        """Check a movie against everything seen so far and remember it if new"""
+        return not self.filter([movie])
+
+    def _is_duplicate(
+        self,
+        movie: Dict,
+        title_signature: np.ndarray,
+        title_keys: List[int],
+        description_signature: Optional[np.ndarray]
+    ) -> bool:
+        key = dedup_key(movie)
+        if not key[0] or key in self._keys:
+            return True
+
+        title, year = key
+        numbers = sequel_numbers(title)
+        # Equal titles also cover spacing variants ("Spider-Man" / "Spiderman")
+        compact = title.replace(' ', '')
+
+        if year is not None:
+            candidates = set(self._titles.get(compact, ()))
+            for band, band_key in enumerate(title_keys):
+                candidates.update(self._title_buckets[band].get(band_key, ()))
+
+            for other in sorted(candidates):
+                other_year = self._years[other]
+                if other_year is None or abs(year - other_year) > 1:
+                    continue
+                if self._numbers[other] != numbers:
+                    continue
+                if other in self._titles.get(compact, ()):
+                    return True
+                other_description = self._description_signatures[other]
+                if (
+                    description_signature is not None
+                    and other_description is not None
+                    and np.mean(self._title_signatures[other] == title_signature) >= self.title_threshold
+                    and np.mean(other_description == description_signature) >= self.threshold
+                ):
+                    return True
+
+        record = len(self._title_signatures)
+        self._keys.add(key)
+        self._titles.setdefault(compact, []).append(record)
+        self._title_signatures.append(title_signature)
+        self._description_signatures.append(description_signature)
+        self._years.append(year)
+        self._numbers.append(numbers)
+        for band, band_key in enumerate(title_keys):
+            self._title_buckets[band].setdefault(band_key, []).append(record)
+        return False
+
+    def filter(self, movies: Iterable[Dict]) -> List[Dict]:
+        """The movies that are not duplicates of each other or of earlier ones"""
+        movies = list(movies)
+        if not movies:
+            return []
+        titles, descriptions = self.signatures(movies)
+        title_keys = self.band_keys(titles)
+        return [
+            movie for movie, title, keys, description in zip(movies, titles, title_keys, descriptions)
+            if not self._is_duplicate(movie, title, keys, description)
+        ]
+
+    def __len__(self) -> int:
+        return len(self._title_signatures)
@@ -0,0 +1,57 @@
+import numpy as np
+from typing import Tuple
+from sklearn.decomposition import TruncatedSVD
+
+VECTOR_SPACES = ('tfidf', 'lsa')
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalise the rows of a dense matrix in place (zero rows stay zero)"""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    np.divide(vectors, norms, out=vectors, where=norms > 0)
+    return vectors
+
+
+class LSAProjection:
+    """
+    Latent semantic analysis: a TruncatedSVD projection of TF-IDF rows.
+
+    Movies become dense float32 vectors of a few hundred dimensions with unit
+    L2 norm, so cosine similarity is a plain (BLAS) dot product and the model
+    has a fixed size regardless of the vocabulary. Only the (dims x vocabulary)
+    component matrix is kept, which is all that is needed to embed new movies.
+    """
+
+    def __init__(self, components: np.ndarray):
+        self.components = np.asarray(components, dtype=np.float32)
+
+    @classmethod
+    def fit(cls, tfidf_matrix, n_components: int = 192, seed: int = 42) -> 'LSAProjection':
+        """Fit the projection on a TF-IDF matrix"""
+        # TruncatedSVD needs fewer components than either matrix dimension
+        n_components = max(1, min(n_components, tfidf_matrix.shape[0] - 1, tfidf_matrix.shape[1] - 1))
+        svd = TruncatedSVD(n_components=n_components, random_state=seed)
+        svd.fit(tfidf_matrix)
+        return cls(svd.components_)
+
+    @property
+    def dimensions(self) -> int:
+        return self.components.shape[0]
+
+    def transform(self, tfidf_rows) -> np.ndarray:
+        """Embed TF-IDF rows as L2-normalised float32 vectors"""
+        vectors = np.asarray(tfidf_rows @ self.components.T, dtype=np.float32)
+        return normalize_rows(vectors)
+
+
+def quantize_int8(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Symmetric per-row int8 quantisation: (codes, float32 scales)"""
+    scales = np.abs(vectors).max(axis=1) / 127.0
+    scales = np.where(scales > 0, scales, 1.0).astype(np.float32)
+    codes = np.clip(np.round(vectors / scales[:, None]), -127, 127).astype(np.int8)
+    return codes, scales
+
+
+def dequantize_int8(codes: np.ndarray, scales: np.ndarray) -> np.ndarray:
+    """Float32 vectors from int8 codes, re-normalised to unit length"""
+    return normalize_rows(codes.astype(np.float32) * scales[:, None])
@@ -4,6 +4,8 @@ from typing import Optional, List, Dict
 from dotenv import load_dotenv
 import time
 
+from services.dedup import MovieDeduplicator
+
 load_dotenv()
 
 class GeminiService:
@@ -89,6 +91,7 @@ Generate exactly {count} movies."""
     
     def _parse_movies(self, text: str) -> List[Dict]:
         movies = []
+        deduplicator = MovieDeduplicator()
         movie_blocks = text.split('MOVIE ')
         
         for block in movie_blocks[1:]:
@@ -134,6 +137,7 @@ Generate exactly {count} movies."""
                 movie.setdefault('rating', 7.0)
                 movie.setdefault('year', 2020)
                 movie.setdefault('release_month', 6)
-                movies.append(movie)
+                if not deduplicator.is_duplicate(movie):
+                    movies.append(movie)
         
         return movies
\ No newline at end of file
@@ -0,0 +1,92 @@
+import re
+import numpy as np
+from typing import Dict, Iterable, List, Optional, Union
+
+# Canonical genre table: a genre's id is its position and its bit is 1 << id.
+# Append only, so persisted masks keep their meaning (at most 32 entries).
+CANONICAL_GENRES = [
+    "Action", "Adventure", "Animation", "Comedy", "Crime", "Documentary",
+    "Drama", "Family", "Fantasy", "History", "Horror", "Music", "Mystery",
+    "Romance", "Sci-Fi", "TV Movie", "Thriller", "War", "Western",
+    "Biography", "Musical", "Sport", "Superhero",
+]
+
+GENRE_IDS: Dict[str, int] = {name: idx for idx, name in enumerate(CANONICAL_GENRES)}
+
+# TMDB genre ids, shared by every TMDB ingestion path
+TMDB_GENRES: Dict[int, str] = {
+    28: "Action", 12: "Adventure", 16: "Animation", 35: "Comedy",
+    80: "Crime", 99: "Documentary", 18: "Drama", 10751: "Family",
+    14: "Fantasy", 36: "History", 27: "Horror", 10402: "Music",
+    9648: "Mystery", 10749: "Romance", 878: "Sci-Fi", 10770: "TV Movie",
+    53: "Thriller", 10752: "War", 37: "Western"
+}
+
+_ALIASES = {
+    "science fiction": "Sci-Fi", "sci fi": "Sci-Fi", "scifi": "Sci-Fi",
+    "historical": "History", "historical drama": "History",
+    "romantic": "Romance", "romcom": "Romance",
+    "animated": "Animation", "anime": "Animation",
+    "biopic": "Biography", "sports": "Sport",
+    "super hero": "Superhero", "tv film": "TV Movie",
+}
+
+_NON_ALNUM = re.compile(r'[^0-9a-z]+')
+
+
+def _genre_key(name: str) -> str:
+    return _NON_ALNUM.sub(' ', name.lower()).strip()
+
+
+_LOOKUP: Dict[str, str] = {_genre_key(name): name for name in CANONICAL_GENRES}
+_LOOKUP.update({_genre_key(alias): name for alias, name in _ALIASES.items()})
+
+_POPCOUNT_8 = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def split_genres(genres: Union[str, Iterable[str], None]) -> List[str]:
+    """Individual genre names from a comma string or a list"""
+    if genres is None:
+        return []
+    if isinstance(genres, str):
+        genres = genres.split(',')
+    return [g.strip() for g in genres if isinstance(g, str) and g.strip()]
+
+
+def canonical_genre(name: str) -> Optional[str]:
+    """Canonical spelling of a genre name, or None if it is not in the table"""
+    return _LOOKUP.get(_genre_key(name))
+
+
+def canonicalize_genres(genres: Union[str, Iterable[str], None]) -> str:
+    """Rewrite a genre list with canonical names, keeping unknown genres as-is"""
+    names = []
+    for name in split_genres(genres):
+        name = canonical_genre(name) or name
+        if name not in names:
+            names.append(name)
+    return ", ".join(names)
+
+
+def genre_mask(genres: Union[str, Iterable[str], None]) -> int:
+    """uint32 bitmask of the canonical genres in a genre list"""
+    mask = 0
+    for name in split_genres(genres):
+        canonical = canonical_genre(name)
+        if canonical is not None:
+            mask |= 1 << GENRE_IDS[canonical]
+    return mask
+
+
+def mask_to_genres(mask: int) -> List[str]:
+    """Canonical genre names set in a mask, in table order"""
+    return [name for idx, name in enumerate(CANONICAL_GENRES) if mask >> idx & 1]
+
+
+def popcount(masks: np.ndarray) -> np.ndarray:
+    """Number of set bits of each uint32 mask"""
+    masks = np.asarray(masks, dtype=np.uint32)
+    return (
+        _POPCOUNT_8[masks & 0xFF] + _POPCOUNT_8[(masks >> 8) & 0xFF] +
+        _POPCOUNT_8[(masks >> 16) & 0xFF] + _POPCOUNT_8[masks >> 24]
+    ).astype(np.int32)
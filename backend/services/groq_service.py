@@ -3,6 +3,8 @@ import requests
 from typing import Optional, List, Dict
 from dotenv import load_dotenv
 
+from services.dedup import MovieDeduplicator
+
 load_dotenv()
 
 class GroqService:
@@ -127,7 +129,7 @@ Generate exactly {batch_size} movies with this exact format. Each movie must hav
             return []
     def _parse_movies(self, text: str) -> List[Dict]:
         movies = []
-        seen_titles = set()  # Track unique titles
+        deduplicator = MovieDeduplicator()  # Exact and near-duplicate titles
         
         print(f"Parsing response... Total length: {len(text)} characters")
         
@@ -172,19 +174,18 @@ Generate exactly {batch_size} movies with this exact format. Each movie must hav
                         movie['release_month'] = 6
             
             if 'title' in movie and 'description' in movie:
-                # Deduplicate by normalized title
-                title_key = movie['title'].lower().strip()
-                if title_key in seen_titles:
-                    print(f"  - Skipping duplicate: {movie['title']}")
-                    continue
-                    
-                seen_titles.add(title_key)
-                movie['id'] = len(movies) + 1
                 movie.setdefault('genres', 'Drama')
                 movie.setdefault('industry', 'International')
                 movie.setdefault('rating', 7.0)
                 movie.setdefault('year', 2020)
                 movie.setdefault('release_month', 6)
+                
+                # Deduplicate by normalized title and year, then by similar text
+                if deduplicator.is_duplicate(movie):
+                    print(f"  - Skipping duplicate: {movie['title']}")
+                    continue
+                    
+                movie['id'] = len(movies) + 1
                 movies.append(movie)
                 print(f"  ✓ Added: {movie['title']} ({movie.get('year', 'N/A')})")
             else:
@@ -0,0 +1,91 @@
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Optional
+
+INGESTION_STAGES = ('tmdb_fetch', 'groq_fetch', 'dedup', 'vectorize', 'index_build', 'neighbor_table')
+
+
+class IngestionProgress:
+    """
+    Thread-safe record of a catalog load and model build.
+
+    Tracks the stage currently running, the number of movies ingested and the
+    time spent in each stage. Stages may run many times (e.g. once per streamed
+    TMDB page), so durations accumulate. Read by the status endpoints.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.state = 'idle'
+        self.stage_name: Optional[str] = None
+        self.movies_ingested = 0
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.error: Optional[str] = None
+        self.durations: Dict[str, float] = {name: 0.0 for name in INGESTION_STAGES}
+        self.runs: Dict[str, int] = {name: 0 for name in INGESTION_STAGES}
+
+    @contextmanager
+    def run(self):
+        """Record one complete load: reset the counters, then mark it done or failed"""
+        with self._lock:
+            self._reset()
+            self.state = 'running'
+            self.started_at = datetime.now()
+        try:
+            yield self
+        except Exception as e:
+            with self._lock:
+                self.state = 'failed'
+                self.error = str(e)
+                self.finished_at = datetime.now()
+            raise
+        with self._lock:
+            self.state = 'done'
+            self.stage_name = None
+            self.finished_at = datetime.now()
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time a block as part of the named stage"""
+        if name not in INGESTION_STAGES:
+            raise ValueError(f"Unknown ingestion stage '{name}', expected one of {INGESTION_STAGES}")
+        with self._lock:
+            previous, self.stage_name = self.stage_name, name
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.durations[name] += elapsed
+                self.runs[name] += 1
+                self.stage_name = previous
+
+    def add_movies(self, count: int):
+        """Count movies that made it through deduplication"""
+        with self._lock:
+            self.movies_ingested += count
+
+    def to_dict(self) -> Dict:
+        """JSON-friendly view of the progress"""
+        with self._lock:
+            end = self.finished_at or datetime.now()
+            return {
+                'state': self.state,
+                'stage': self.stage_name,
+                'movies_ingested': self.movies_ingested,
+                'started_at': self.started_at.isoformat() if self.started_at else None,
+                'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+                'elapsed_seconds': round((end - self.started_at).total_seconds(), 3) if self.started_at else None,
+                'stages': {
+                    name: {'seconds': round(self.durations[name], 3), 'runs': self.runs[name]}
+                    for name in INGESTION_STAGES
+                },
+                'error': self.error,
+            }
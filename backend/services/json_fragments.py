@@ -0,0 +1,68 @@
+import json
+import numpy as np
+from typing import Dict, List, Sequence
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, the standard library encoder gives identical output
+    orjson = None
+
+from models.movie import MovieResponse
+
+# Response fields filled from the catalog; the rest are always null in listings
+_OPTIONAL_NULLS = [name for name in MovieResponse.model_fields if name not in (
+    'id', 'title', 'genres', 'description', 'rating', 'year', 'release_month'
+)]
+
+
+def dumps(value) -> bytes:
+    """Compact UTF-8 JSON, as FastAPI would encode it"""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'), allow_nan=False).encode()
+
+
+def join_array(fragments: Sequence[bytes]) -> bytes:
+    """JSON array from already encoded elements"""
+    return b'[' + b','.join(fragments) + b']'
+
+
+class MovieFragments:
+    """
+    Encoded MovieResponse JSON of each catalog row.
+
+    Rows are encoded the first time they are served and reused until the
+    catalog (and so the model version) is replaced, so listing responses are
+    assembled by joining bytes instead of building, validating and encoding
+    a MovieResponse per movie. Rows encoded concurrently by two requests are
+    simply encoded twice with the same result.
+    """
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self._fragments = np.full(len(catalog), None, dtype=object)
+
+    def encode(self, fields: Dict) -> bytes:
+        """JSON of one movie in MovieResponse field order"""
+        for name in _OPTIONAL_NULLS:
+            fields.setdefault(name, None)
+        return dumps({name: fields[name] for name in MovieResponse.model_fields})
+
+    def fragments(self, rows: Sequence[int]) -> List[bytes]:
+        """Encoded movies for the given rows, in order"""
+        rows = np.asarray(rows, dtype=np.int64)
+        fragments = self._fragments[rows]
+        missing = np.flatnonzero(np.equal(fragments, None))
+        if len(missing):
+            missing_rows = rows[missing]
+            encoded = np.fromiter(
+                (self.encode(fields) for fields in self.catalog.to_dicts(missing_rows)),
+                dtype=object, count=len(missing_rows)
+            )
+            fragments[missing] = encoded
+            self._fragments[missing_rows] = encoded
+        return fragments.tolist()
+
+    def to_json(self, rows: Sequence[int]) -> bytes:
+        """JSON array of the given rows"""
+        return join_array(self.fragments(rows))
@@ -0,0 +1,48 @@
+import copy
+from typing import Optional
+
+
+class ModelSnapshot:
+    """
+    Everything a trained model serves from: catalog, vectors, indexes and version.
+
+    Snapshots are never modified once published. Training, loading and
+    incremental updates build a new snapshot and the engine swaps a single
+    reference to it, so requests that started on the old snapshot finish on it.
+    """
+
+    FIELDS = (
+        'movies_df', 'tfidf_vectorizer', 'tfidf_matrix', 'lsa', 'item_vectors',
+        'cosine_sim', 'ann_index', 'catalog', 'title_codes', 'id_index',
+        'title_index', 'search_index', 'prefix_index', 'ranker',
+        'neighbor_ids', 'neighbor_scores', 'model_version',
+    )
+
+    def __init__(self, **fields):
+        unknown = set(fields) - set(self.FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown snapshot fields: {sorted(unknown)}")
+        for name in self.FIELDS:
+            setattr(self, name, fields.get(name))
+        if self.id_index is None:
+            self.id_index = {}
+
+    def copy(self) -> 'ModelSnapshot':
+        """Shallow copy to build the next snapshot from"""
+        return copy.copy(self)
+
+    def replace(self, **changes) -> 'ModelSnapshot':
+        """Shallow copy with some fields replaced"""
+        snapshot = self.copy()
+        for name, value in changes.items():
+            if name not in self.FIELDS:
+                raise ValueError(f"Unknown snapshot field: {name}")
+            setattr(snapshot, name, value)
+        return snapshot
+
+    @property
+    def version(self) -> Optional[str]:
+        return self.model_version
+
+    def __len__(self) -> int:
+        return len(self.catalog) if self.catalog is not None else 0
@@ -0,0 +1,218 @@
+import os
+import json
+import shutil
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from services.embeddings import quantize_int8, dequantize_int8
+
+ARTIFACT_FORMAT = 2
+# Format 1 predates LSA embeddings and is always a TF-IDF model
+SUPPORTED_FORMATS = (1, 2)
+DEFAULT_ARTIFACT_DIR = Path(__file__).parent.parent / "data" / "models"
+
+
+class ModelArtifactStore:
+    """
+    Versioned on-disk store for trained recommendation models.
+
+    Each version lives in its own directory:
+    - manifest.json: version, format, creation time and engine settings
+    - movies.json: the movie catalog the model was trained on
+    - vocabulary.json / idf.npy: the fitted TF-IDF vectorizer
+    - tfidf_{data,indices,indptr}.npy: the CSR TF-IDF matrix (TF-IDF models)
+    - lsa_components.npy and embeddings.npy, or embeddings_int8.npy plus
+      embedding_scales.npy when quantised: the LSA projection and the movie
+      embeddings (LSA models)
+    - neighbor_ids.npy / neighbor_scores.npy: the top-K neighbour table
+
+    Matrix components are stored as plain .npy files rather than an .npz
+    archive so they can be memory-mapped on load. A CURRENT file in the base
+    directory names the active version and is replaced atomically on save.
+    """
+
+    def __init__(self, base_dir: Optional[str] = None, keep_versions: int = 3, quantize: Optional[str] = None):
+        self.base_dir = Path(base_dir or os.getenv('MODEL_ARTIFACT_DIR', DEFAULT_ARTIFACT_DIR))
+        self.keep_versions = keep_versions
+        # 'int8' stores LSA embeddings as int8 codes with per-row scales (4x smaller)
+        self.quantize = (quantize or os.getenv('LSA_QUANTIZE', 'none')).lower()
+
+    def current_version(self) -> Optional[str]:
+        """Name of the active artifact version, if any"""
+        pointer = self.base_dir / "CURRENT"
+        if not pointer.exists():
+            return None
+        version = pointer.read_text().strip()
+        return version if (self.base_dir / version / "manifest.json").exists() else None
+
+    def read_manifest(self, version: Optional[str] = None) -> Optional[Dict]:
+        """Read the manifest of a version (the current one by default)"""
+        version = version or self.current_version()
+        if not version:
+            return None
+        with open(self.base_dir / version / "manifest.json") as f:
+            return json.load(f)
+
+    def save(self, engine, version: Optional[str] = None) -> str:
+        """Write the engine's trained state as a new version and make it current"""
+        if engine.tfidf_vectorizer is None or engine.neighbor_ids is None:
+            raise Exception("Model not trained. Call train_model() first.")
+
+        version = version or datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        staging = self.base_dir / f".{version}.tmp"
+        if staging.exists():
+            shutil.rmtree(staging)
+        staging.mkdir()
+
+        catalog = engine.movies_df.drop(columns=['combined_features'], errors='ignore')
+        catalog.to_json(staging / "movies.json", orient='records')
+
+        vectorizer = engine.tfidf_vectorizer
+        with open(staging / "vocabulary.json", 'w') as f:
+            json.dump({term: int(idx) for term, idx in vectorizer.vocabulary_.items()}, f)
+        np.save(staging / "idf.npy", vectorizer.idf_.astype(np.float64))
+
+        quantized = False
+        if engine.lsa is not None:
+            np.save(staging / "lsa_components.npy", engine.lsa.components)
+            embeddings = np.asarray(engine.item_vectors, dtype=np.float32)
+            if self.quantize == 'int8':
+                codes, scales = quantize_int8(embeddings)
+                np.save(staging / "embeddings_int8.npy", codes)
+                np.save(staging / "embedding_scales.npy", scales)
+                quantized = True
+            else:
+                np.save(staging / "embeddings.npy", embeddings)
+            n_movies = embeddings.shape[0]
+        else:
+            matrix = sparse.csr_matrix(engine.tfidf_matrix)
+            np.save(staging / "tfidf_data.npy", matrix.data)
+            np.save(staging / "tfidf_indices.npy", matrix.indices)
+            np.save(staging / "tfidf_indptr.npy", matrix.indptr)
+            n_movies = matrix.shape[0]
+
+        np.save(staging / "neighbor_ids.npy", np.asarray(engine.neighbor_ids, dtype=np.int32))
+        np.save(staging / "neighbor_scores.npy", np.asarray(engine.neighbor_scores, dtype=np.float32))
+
+        manifest = {
+            'version': version,
+            'format': ARTIFACT_FORMAT,
+            'created_at': datetime.now().isoformat(),
+            'num_movies': int(n_movies),
+            'num_features': len(vectorizer.vocabulary_),
+            'similarity_mode': engine.similarity_mode,
+            'vector_space': 'lsa' if engine.lsa is not None else 'tfidf',
+            'embedding_dim': engine.lsa.dimensions if engine.lsa is not None else None,
+            'quantized': quantized,
+            'neighbor_k': int(engine.neighbor_ids.shape[1]),
+            'vectorizer_params': self._vectorizer_params(vectorizer),
+        }
+        with open(staging / "manifest.json", 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+        final_dir = self.base_dir / version
+        if final_dir.exists():
+            shutil.rmtree(final_dir)
+        os.replace(staging, final_dir)
+
+        pointer_tmp = self.base_dir / "CURRENT.tmp"
+        pointer_tmp.write_text(version)
+        os.replace(pointer_tmp, self.base_dir / "CURRENT")
+
+        self._prune()
+        print(f"✓ Saved model artifacts version {version} to {final_dir}")
+        return version
+
+    def load(self, version: Optional[str] = None) -> Optional[Dict]:
+        """
+        Load a version (the current one by default) with arrays memory-mapped.
+
+        Returns a dict with the manifest, catalog DataFrame, rebuilt vectorizer,
+        item vectors (the TF-IDF matrix or the LSA embeddings), LSA components
+        (None for TF-IDF models) and neighbour table, or None when nothing
+        usable exists.
+        """
+        version = version or self.current_version()
+        if not version:
+            return None
+
+        manifest = self.read_manifest(version)
+        if manifest.get('format') not in SUPPORTED_FORMATS:
+            print(f"⚠️ Ignoring model artifacts {version}: unsupported format {manifest.get('format')}")
+            return None
+
+        path = self.base_dir / version
+        with open(path / "movies.json") as f:
+            movies_df = pd.DataFrame(json.load(f))
+
+        with open(path / "vocabulary.json") as f:
+            vocabulary = json.load(f)
+        params = dict(manifest['vectorizer_params'])
+        if params.get('ngram_range') is not None:
+            params['ngram_range'] = tuple(params['ngram_range'])
+        vectorizer = TfidfVectorizer(**params)
+        vectorizer.vocabulary_ = vocabulary
+        vectorizer.idf_ = np.load(path / "idf.npy")
+
+        tfidf_matrix = None
+        lsa_components = None
+        if manifest.get('vector_space', 'tfidf') == 'lsa':
+            lsa_components = np.load(path / "lsa_components.npy")
+            if manifest.get('quantized'):
+                item_vectors = dequantize_int8(
+                    np.load(path / "embeddings_int8.npy"), np.load(path / "embedding_scales.npy")
+                )
+            else:
+                item_vectors = np.load(path / "embeddings.npy", mmap_mode='c')
+        else:
+            # Copy-on-write maps: pages are shared until an incremental update touches them
+            tfidf_matrix = sparse.csr_matrix(
+                (
+                    np.load(path / "tfidf_data.npy", mmap_mode='c'),
+                    np.load(path / "tfidf_indices.npy", mmap_mode='c'),
+                    np.load(path / "tfidf_indptr.npy", mmap_mode='c'),
+                ),
+                shape=(manifest['num_movies'], manifest['num_features']),
+                copy=False
+            )
+            item_vectors = tfidf_matrix
+
+        return {
+            'manifest': manifest,
+            'movies_df': movies_df,
+            'vectorizer': vectorizer,
+            'tfidf_matrix': tfidf_matrix,
+            'item_vectors': item_vectors,
+            'lsa_components': lsa_components,
+            'neighbor_ids': np.load(path / "neighbor_ids.npy", mmap_mode='c'),
+            'neighbor_scores': np.load(path / "neighbor_scores.npy", mmap_mode='c'),
+        }
+
+    def _vectorizer_params(self, vectorizer: TfidfVectorizer) -> Dict:
+        """JSON-serialisable constructor parameters of the vectorizer"""
+        params = {}
+        for key, value in vectorizer.get_params().items():
+            if key in ('dtype', 'vocabulary'):
+                continue
+            if isinstance(value, tuple):
+                value = list(value)
+            if value is None or isinstance(value, (str, int, float, bool, list)):
+                params[key] = value
+        return params
+
+    def _prune(self):
+        """Delete all but the newest `keep_versions` versions"""
+        versions: List[Path] = sorted(
+            (p for p in self.base_dir.iterdir() if p.is_dir() and not p.name.startswith('.')),
+            key=lambda p: p.name
+        )
+        current = self.current_version()
+        for stale in versions[:-self.keep_versions]:
+            if stale.name != current:
+                shutil.rmtree(stale, ignore_errors=True)
@@ -5,6 +5,9 @@ from dotenv import load_dotenv
 from datetime import datetime
 import time
 
+from services.genres import TMDB_GENRES
+from services.dedup import MovieDeduplicator
+
 load_dotenv()
 
 class MovieDatabaseService:
@@ -151,6 +154,7 @@ class MovieDatabaseService:
         
         all_movies = []
         seen_ids = set()
+        deduplicator = MovieDeduplicator()
         
         # Calculate 30-day window
         current_date = datetime.now()
@@ -178,10 +182,9 @@ class MovieDatabaseService:
                 movies = self._get_tmdb_latest_movies_filtered(region_code, page, thirty_days_ago, current_date)
                 for movie in movies[:count]:
                     movie_id = movie['id']
-                    movie_title = movie['title'].lower().strip()
                     
-                    # Check for both ID and title duplicates
-                    if movie_id not in seen_ids and not any(m['title'].lower().strip() == movie_title for m in all_movies):
+                    # Check for both ID and title/near duplicates (constant time per movie)
+                    if movie_id not in seen_ids and not deduplicator.is_duplicate(movie):
                         seen_ids.add(movie_id)
                         all_movies.append(movie)
                         
@@ -424,15 +427,7 @@ class MovieDatabaseService:
     
     def _get_genre_names(self, genre_ids: List[int]) -> str:
         """Convert genre IDs to names"""
-        genre_map = {
-            28: 'Action', 12: 'Adventure', 16: 'Animation', 35: 'Comedy',
-            80: 'Crime', 99: 'Documentary', 18: 'Drama', 10751: 'Family',
-            14: 'Fantasy', 36: 'History', 27: 'Horror', 10402: 'Music',
-            9648: 'Mystery', 10749: 'Romance', 878: 'Science Fiction',
-            10770: 'TV Movie', 53: 'Thriller', 10752: 'War', 37: 'Western'
-        }
-        
-        genres = [genre_map.get(gid, '') for gid in genre_ids[:3]]
+        genres = [TMDB_GENRES.get(gid, '') for gid in genre_ids[:3]]
         genres = [g for g in genres if g]  # Remove empty strings
         return ', '.join(genres) if genres else 'Drama'
     
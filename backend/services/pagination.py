@@ -0,0 +1,40 @@
+import base64
+import json
+from typing import Optional
+
+# Presorted MovieCatalog orders that listing endpoints page through
+LISTING_ORDERS = {
+    'rating': 'by_rating',            # /api/all-movies
+    'rating_year': 'by_rating_year',  # /api/movies
+}
+
+
+class CursorError(ValueError):
+    """A cursor that is malformed or belongs to another listing or model version"""
+
+
+def encode_cursor(version: Optional[str], listing: str, search: Optional[str], offset: int) -> str:
+    """Opaque cursor for the page of a listing that starts at `offset`"""
+    payload = json.dumps([version, listing, search or None, offset], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, version: Optional[str], listing: str, search: Optional[str]) -> int:
+    """
+    Offset a cursor points at.
+
+    Raises CursorError unless the cursor was issued for the same listing and
+    search by the model version being served (orders change when it does).
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        cursor_version, cursor_listing, cursor_search, offset = json.loads(base64.urlsafe_b64decode(padded))
+        offset = int(offset)
+    except Exception:
+        raise CursorError("Invalid cursor")
+
+    if cursor_listing != listing or cursor_search != (search or None) or offset < 0:
+        raise CursorError("Cursor does not belong to this listing or search")
+    if cursor_version != version:
+        raise CursorError("The catalog has been updated since this cursor was issued, start again from the first page")
+    return offset
@@ -0,0 +1,123 @@
+import os
+import numpy as np
+from datetime import datetime
+from typing import Dict, Optional
+
+RANKING_COMPONENTS = ('similarity', 'rating', 'popularity', 'recency')
+
+
+def _weights_from_env() -> Dict[str, float]:
+    """Default weights from RANKING_WEIGHTS, e.g. "similarity=0.7,rating=0.2,recency=0.1" """
+    weights = {'similarity': 1.0, 'rating': 0.0, 'popularity': 0.0, 'recency': 0.0}
+    for item in os.getenv('RANKING_WEIGHTS', '').split(','):
+        if '=' not in item:
+            continue
+        name, value = (part.strip() for part in item.split('=', 1))
+        if name in weights:
+            weights[name] = float(value)
+    return weights
+
+
+class HybridRanker:
+    """
+    Re-ranks candidate movies by a weighted blend of normalised components:
+
+    - similarity: the candidate's cosine similarity to the query
+    - rating: Bayesian-smoothed rating, pulled towards the catalog mean when
+      a movie has few votes (movies without vote counts get the mean)
+    - popularity: log popularity relative to the most popular movie
+    - recency: exponential decay with the movie's age
+
+    The catalog-dependent components are computed once per catalog, so scoring
+    a candidate set is a gather and a weighted sum.
+    """
+
+    def __init__(
+        self,
+        catalog,
+        default_weights: Optional[Dict[str, float]] = None,
+        prior_votes: Optional[float] = None,
+        recency_half_life: Optional[float] = None
+    ):
+        self.default_weights = default_weights or _weights_from_env()
+        prior_votes = prior_votes or float(os.getenv('RANKING_PRIOR_VOTES', '100'))
+        half_life = recency_half_life or float(os.getenv('RANKING_RECENCY_HALF_LIFE_YEARS', '10'))
+
+        ratings = catalog.ratings.astype(np.float64)
+        votes = catalog.vote_counts.astype(np.float64)
+        mean_rating = float(ratings.mean()) if len(ratings) else 0.0
+        bayesian = (votes * ratings + prior_votes * mean_rating) / (votes + prior_votes)
+        self.rating = (bayesian / 10.0).astype(np.float32)
+
+        log_popularity = np.log1p(np.clip(catalog.popularity, 0, None)).astype(np.float64)
+        top = float(log_popularity.max()) if len(log_popularity) else 0.0
+        self.popularity = (log_popularity / top if top > 0 else log_popularity).astype(np.float32)
+
+        now = datetime.now()
+        months = np.where(catalog.months > 0, catalog.months, 6).astype(np.float64)
+        age = (now.year + (now.month - 1) / 12) - (catalog.years + (months - 1) / 12)
+        self.recency = np.exp2(-np.clip(age, 0, None) / half_life).astype(np.float32)
+
+    def weights(self, overrides: Optional[Dict[str, float]] = None) -> Dict[str, float]:
+        """Default weights updated with per-request overrides"""
+        weights = dict(self.default_weights)
+        for name, value in (overrides or {}).items():
+            if name not in RANKING_COMPONENTS:
+                raise ValueError(f"Unknown ranking component '{name}', expected one of {RANKING_COMPONENTS}")
+            if value is not None:
+                weights[name] = float(value)
+        return weights
+
+    def is_similarity_only(self, weights: Dict[str, float]) -> bool:
+        """True when the blend reduces to plain similarity order"""
+        return all(weights[name] == 0 for name in RANKING_COMPONENTS if name != 'similarity')
+
+    def score(self, rows: np.ndarray, similarity: np.ndarray, weights: Dict[str, float]) -> np.ndarray:
+        """Hybrid scores of candidate rows given their similarity to the query"""
+        rows = np.asarray(rows, dtype=np.int64)
+        return (
+            weights['similarity'] * np.asarray(similarity, dtype=np.float32) +
+            weights['rating'] * self.rating[rows] +
+            weights['popularity'] * self.popularity[rows] +
+            weights['recency'] * self.recency[rows]
+        )
+
+    def rerank(
+        self,
+        rows: np.ndarray,
+        similarity: np.ndarray,
+        weights: Dict[str, float],
+        limit: Optional[int] = None
+    ) -> np.ndarray:
+        """Positions of the candidates ordered by hybrid score, best first"""
+        order = np.argsort(-self.score(rows, similarity, weights), kind='stable')
+        return order[:limit] if limit is not None else order
+
+
+def mmr_rerank(
+    relevance: np.ndarray,
+    similarity_block: np.ndarray,
+    diversity: float,
+    limit: int
+) -> np.ndarray:
+    """
+    Positions of up to `limit` candidates picked greedily by Maximal Marginal Relevance.
+
+    Each step takes the candidate maximising
+    (1 - diversity) * relevance - diversity * (max similarity to the picks so far),
+    so diversity=0 keeps relevance order and higher values spread the picks out.
+    `similarity_block` is the M x M candidate-to-candidate similarity matrix.
+    """
+    relevance = np.asarray(relevance, dtype=np.float64)
+    limit = min(limit, len(relevance))
+    redundancy = np.zeros(len(relevance))
+    available = np.ones(len(relevance), dtype=bool)
+    picks = np.empty(limit, dtype=np.int64)
+
+    for step in range(limit):
+        marginal = np.where(available, (1 - diversity) * relevance - diversity * redundancy, -np.inf)
+        pick = int(np.argmax(marginal))
+        picks[step] = pick
+        available[pick] = False
+        redundancy = np.maximum(redundancy, similarity_block[pick])
+    return picks
@@ -0,0 +1,113 @@
+import numpy as np
+from functools import lru_cache
+from itertools import product
+from typing import FrozenSet, List, Sequence, Union
+
+from services.genres import mask_to_genres, split_genres
+
+# Similarity above which a recommendation gets the "similar storyline" or
+# "very similar content" note
+SIMILARITY_BUCKETS = (0.5, 0.7)
+_SIMILARITY_NOTES = (None, "Similar storyline and style", "Very similar content and themes")
+
+
+def _template_table() -> List[str]:
+    """
+    One reason template per combination of feature flags.
+
+    Indexed by (shared genres, similar rating, same decade, similarity bucket)
+    packed as shared * 12 + rating * 6 + decade * 3 + bucket.
+    """
+    templates = []
+    for shared, rating, decade, bucket in product((0, 1), (0, 1), (0, 1), (0, 1, 2)):
+        parts = []
+        if shared:
+            parts.append("{genres}")
+        if rating:
+            parts.append("Similar rating ({rating}/10)")
+        if decade:
+            parts.append("From the same era ({decade}s)")
+        if _SIMILARITY_NOTES[bucket]:
+            parts.append(_SIMILARITY_NOTES[bucket])
+        templates.append(" • ".join(parts) if parts else "Recommended based on content similarity")
+    return templates
+
+
+REASON_TEMPLATES = _template_table()
+
+
+@lru_cache(maxsize=4096)
+def shared_genres_text(genres: FrozenSet[str]) -> str:
+    """Reason fragment for a set of shared (lowercase) genre names"""
+    genre_list = ', '.join(sorted(genres))
+    return f"Shares {genre_list} genre{' ' if len(genres) == 1 else 's'}"
+
+
+@lru_cache(maxsize=4096)
+def _mask_genres(mask: int) -> FrozenSet[str]:
+    """Lowercase names of the canonical genres in a mask"""
+    return frozenset(g.lower() for g in mask_to_genres(mask))
+
+
+@lru_cache(maxsize=65536)
+def _shared_string_genres(target_genres: str, genres: str) -> FrozenSet[str]:
+    """Lowercase genre names two genre strings have in common"""
+    return (
+        frozenset(g.lower() for g in split_genres(target_genres))
+        & frozenset(g.lower() for g in split_genres(genres))
+    )
+
+
+def recommendation_reasons(
+    catalog,
+    target_rows: Union[int, Sequence[int]],
+    rows: Sequence[int],
+    similarity_scores: Sequence[float]
+) -> List[str]:
+    """
+    Why each candidate row was recommended for its target row.
+
+    The feature flags (shared-genre mask, rating within 0.5, same decade,
+    similarity bucket) are computed for all candidates at once; only the
+    final string formatting is per candidate. Pairs where either movie has a
+    genre outside the canonical table compare their genre strings instead of
+    the masks. `target_rows` is a single row or one target per candidate.
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    if len(rows) == 0:
+        return []
+    targets = np.broadcast_to(np.asarray(target_rows, dtype=np.int64), rows.shape)
+    scores = np.asarray(similarity_scores, dtype=np.float64)
+
+    shared_masks = (catalog.genre_masks[targets] & catalog.genre_masks[rows]).tolist()
+    shared = [_mask_genres(mask) for mask in shared_masks]
+    target_codes, codes = catalog.genre_codes[targets], catalog.genre_codes[rows]
+    extra = catalog.genre_extra[target_codes] | catalog.genre_extra[codes]
+    for i in np.flatnonzero(extra).tolist():
+        shared[i] = _shared_string_genres(
+            catalog.genre_values[target_codes[i]], catalog.genre_values[codes[i]]
+        )
+    ratings = catalog.ratings[rows]
+    similar_rating = np.abs(catalog.ratings[targets] - ratings) < 0.5
+    decades = (catalog.years[rows] // 10) * 10
+    same_decade = (catalog.years[targets] // 10) * 10 == decades
+    bucket = np.searchsorted(SIMILARITY_BUCKETS, scores, side='left')
+
+    has_shared = np.fromiter((bool(genres) for genres in shared), dtype=bool, count=len(shared))
+    templates = has_shared * 12 + similar_rating * 6 + same_decade * 3 + bucket
+    return [
+        _render(template, genres, rating, decade)
+        for template, genres, rating, decade in zip(
+            templates.tolist(), shared, ratings.tolist(), decades.tolist()
+        )
+    ]
+
+
+@lru_cache(maxsize=65536)
+def _render(template: int, genres: FrozenSet[str], rating: float, decade: int) -> str:
+    """Reason text for one combination of template and fragment values"""
+    return REASON_TEMPLATES[template].format(
+        genres=shared_genres_text(genres) if genres else '',
+        rating=rating,
+        decade=decade
+    )
@@ -2,24 +2,257 @@ import pandas as pd
 import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
-from typing import List, Dict, Optional
+from scipy import sparse
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from collections import OrderedDict
+from datetime import datetime
+from contextlib import contextmanager
+from functools import wraps
+import copy
 import os
+import re
+import threading
 
 from models.movie import MovieResponse, RecommendationResponse
 from services.ai_service import AIEnhancementService
+from services.similarity import (
+    top_k_similar, build_neighbor_table, dedupe_neighbors, merge_neighbor_candidates,
+    pairwise_block, dot_block
+)
+from services.ann_index import LSHIndex
+from services.model_store import ModelArtifactStore
+from services.title_index import TitleIndex, PrefixIndex
+from services.search_index import SearchIndex
+from services.catalog import MovieCatalog
+from services.ranking import HybridRanker, mmr_rerank
+from services.embeddings import LSAProjection, VECTOR_SPACES
+from services.model_snapshot import ModelSnapshot
+from services.ingestion_progress import IngestionProgress
+from services.dedup import MovieDeduplicator, dedup_key
+from services.reasons import recommendation_reasons
+from services.pagination import LISTING_ORDERS, encode_cursor, decode_cursor
+from services.genres import (
+    canonical_genre, canonicalize_genres, genre_mask, mask_to_genres, split_genres, popcount
+)
+
+SIMILARITY_MODES = ('dense', 'sparse', 'lsh')
+
+
+def _snapshot_field(name: str) -> property:
+    """Engine attribute backed by the active model snapshot"""
+    def get(self):
+        return getattr(self._active_snapshot(), name)
+    
+    def set(self, value):
+        staging = getattr(self._local, 'staging', None)
+        if staging is not None:
+            setattr(staging, name, value)
+        else:
+            # Outside a staged build a single assignment publishes a copy
+            with self._write_lock:
+                self.snapshot = self.snapshot.replace(**{name: value})
+    
+    return property(get, set)
+
+
+def _reads_snapshot(method):
+    """Serve every read made by the method from the snapshot current at entry"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.pinned():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def _publishes_snapshot(method):
+    """Build the method's changes on a private snapshot and publish it on success"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._staged():
+            return method(self, *args, **kwargs)
+    return wrapper
+
 
 class RecommendationEngine:
-    def __init__(self):
-        self.movies_df = None
-        self.tfidf_matrix = None
-        self.tfidf_vectorizer = None
-        self.cosine_sim = None
+    # Model state, read from and written to the active ModelSnapshot
+    movies_df = _snapshot_field('movies_df')
+    tfidf_vectorizer = _snapshot_field('tfidf_vectorizer')
+    tfidf_matrix = _snapshot_field('tfidf_matrix')
+    lsa = _snapshot_field('lsa')
+    item_vectors = _snapshot_field('item_vectors')
+    cosine_sim = _snapshot_field('cosine_sim')
+    ann_index = _snapshot_field('ann_index')
+    catalog = _snapshot_field('catalog')
+    title_codes = _snapshot_field('title_codes')
+    id_index = _snapshot_field('id_index')
+    title_index = _snapshot_field('title_index')
+    search_index = _snapshot_field('search_index')
+    prefix_index = _snapshot_field('prefix_index')
+    ranker = _snapshot_field('ranker')
+    neighbor_ids = _snapshot_field('neighbor_ids')
+    neighbor_scores = _snapshot_field('neighbor_scores')
+    model_version = _snapshot_field('model_version')
+    
+    def __init__(self, similarity_mode: Optional[str] = None):
+        # 'sparse' computes top-k neighbours on demand from the TF-IDF matrix,
+        # 'dense' keeps the legacy precomputed N x N cosine matrix and
+        # 'lsh' serves approximate neighbours from a random-projection index
+        self.similarity_mode = similarity_mode or os.getenv('SIMILARITY_MODE', 'sparse').lower()
+        if self.similarity_mode not in SIMILARITY_MODES:
+            raise ValueError(f"Unknown similarity mode '{self.similarity_mode}', expected one of {SIMILARITY_MODES}")
+        # 'tfidf' serves similarity from the sparse TF-IDF rows, 'lsa' from dense
+        # TruncatedSVD embeddings of them (works with every similarity mode)
+        self.vector_space = os.getenv('VECTOR_SPACE', 'tfidf').lower()
+        if self.vector_space not in VECTOR_SPACES:
+            raise ValueError(f"Unknown vector space '{self.vector_space}', expected one of {VECTOR_SPACES}")
+        self.lsa_dimensions = int(os.getenv('LSA_DIMENSIONS', '192'))
+        self.similarity_chunk_size = int(os.getenv('SIMILARITY_CHUNK_SIZE', '4096'))
+        self.neighbor_k = int(os.getenv('NEIGHBOR_K', '32'))
+        # Neighbour table build: rows per block and parallel workers (0 = one per core)
+        self.neighbor_block_size = int(os.getenv('NEIGHBOR_BLOCK_SIZE', '512'))
+        self.neighbor_workers = int(os.getenv('NEIGHBOR_BUILD_WORKERS', '0')) or os.cpu_count() or 1
+        self.lsh_params = {
+            'n_tables': int(os.getenv('LSH_TABLES', '8')),
+            'n_bits': int(os.getenv('LSH_BITS')) if os.getenv('LSH_BITS') else None,
+            'n_probes': int(os.getenv('LSH_PROBES', '2')),
+            'max_candidates': int(os.getenv('LSH_MAX_CANDIDATES', '2000')),
+            'bucket_size': int(os.getenv('LSH_BUCKET_SIZE', '64')),
+        }
+        # Candidates fetched per requested result when re-ranking with a hybrid blend or MMR
+        self.ranking_candidate_factor = int(os.getenv('RANKING_CANDIDATE_FACTOR', '3'))
+        self.mmr_candidates = int(os.getenv('MMR_CANDIDATES', '30'))
+        # Model state (catalog, vectors, indexes, version) lives in an immutable
+        # snapshot that is swapped as a whole; see pinned() and _staged()
+        self._local = threading.local()
+        self._write_lock = threading.RLock()
+        self.snapshot = ModelSnapshot()
+        # Stage timings of the current or last catalog load, for the status endpoints
+        self.progress = IngestionProgress()
+        # Full search orderings per (model version, query), so listing pages are slices
+        self.listing_cache_size = int(os.getenv('LISTING_CACHE_SIZE', '256'))
+        self._listing_cache: OrderedDict = OrderedDict()
+        self._listing_lock = threading.Lock()
+        self.artifact_store = ModelArtifactStore()
         self.ai_service = AIEnhancementService()
         self.movie_db_service = None
     
+    def _active_snapshot(self) -> ModelSnapshot:
+        """Snapshot this thread reads from: staged, pinned, or the current one"""
+        local = self._local
+        for snapshot in (getattr(local, 'staging', None), getattr(local, 'pinned', None)):
+            if snapshot is not None:
+                return snapshot
+        return self.snapshot
+    
+    @contextmanager
+    def pinned(self):
+        """
+        Pin this thread to the current snapshot for the duration of the block.
+        
+        A model swap while the block runs does not affect it, so row numbers
+        and scores obtained from several engine calls stay consistent.
+        """
+        local = self._local
+        if getattr(local, 'pinned', None) is not None or getattr(local, 'staging', None) is not None:
+            yield self._active_snapshot()
+            return
+        local.pinned = self.snapshot
+        try:
+            yield local.pinned
+        finally:
+            local.pinned = None
+    
+    @contextmanager
+    def _staged(self):
+        """
+        Build the next snapshot off to the side and publish it atomically.
+        
+        Assignments to model attributes inside the block go to a private copy
+        of the current snapshot; other threads keep serving the current one
+        until the block completes. Nothing is published if the block raises.
+        """
+        local = self._local
+        if getattr(local, 'staging', None) is not None:
+            yield local.staging
+            return
+        with self._write_lock:
+            local.staging = self._active_snapshot().copy()
+            try:
+                yield local.staging
+                self.publish(local.staging)
+            finally:
+                local.staging = None
+    
+    def publish(self, snapshot: ModelSnapshot):
+        """Make `snapshot` the one served to new requests (a single reference swap)"""
+        with self._write_lock:
+            if snapshot.neighbor_ids is not None:
+                self.neighbor_k = int(snapshot.neighbor_ids.shape[1])
+            self.snapshot = snapshot
+    
+    def refresh(self) -> bool:
+        """
+        Reload the movie data, retrain and swap the new model in.
+        
+        The new model is trained in a separate engine while requests keep being
+        served from the current snapshot. Returns False, keeping the current
+        model, when the new catalog is less than half the size of the current
+        one (degraded data sources such as the sample fallback).
+        """
+        staging = RecommendationEngine(self.similarity_mode)
+        staging.progress = self.progress
+        with self.progress.run():
+            staging.load_data()
+            print("✓ Movie data loaded")
+            staging.train_model()
+            print("✓ ML model trained")
+        
+        current = self.snapshot
+        if current.catalog is not None and len(staging.snapshot) < len(current) // 2:
+            print("✗ Refreshed catalog is much smaller than the loaded one, keeping current model")
+            return False
+        try:
+            staging.save_model()
+        except Exception as e:
+            print(f"✗ Saving model artifacts failed: {e}")
+        
+        self.publish(staging.snapshot)
+        print(f"✓ Swapped in model version {staging.model_version}")
+        return True
+    
     def load_data(self):
         """Load comprehensive movie dataset (3000 movies) for search and recommendations"""
-        all_movies = []
+        all_movies = [movie for batch in self._stream_movies() for movie in batch]
+        if all_movies:
+            self.movies_df = pd.DataFrame(all_movies)
+            print(f"🎯 Total unique movies for search/recommendations: {len(self.movies_df)}")
+            return
+        
+        # Fallback to sample if needed
+        print("⚠️ No movies from APIs, using sample dataset")
+        self.create_sample_dataset()
+    
+    def _stream_movies(self) -> Iterator[List[Dict]]:
+        """
+        Batches of new movies as the data sources deliver them.
+        
+        TMDB pages are yielded as they are fetched, followed by the Groq movies.
+        Exact and near-duplicates are dropped across sources (the first source
+        wins), movies are numbered in arrival order and genres canonicalized.
+        """
+        deduplicator = MovieDeduplicator()
+        count = 0
+        
+        def unique(movies: List[Dict]) -> List[Dict]:
+            nonlocal count
+            with self.progress.stage('dedup'):
+                batch = deduplicator.filter(movies)
+                for offset, movie in enumerate(batch):
+                    movie['id'] = count + offset + 1
+                    movie['genres'] = canonicalize_genres(movie.get('genres'))
+            count += len(batch)
+            self.progress.add_movies(len(batch))
+            return batch
         
         try:
             # Try TMDB first - NO DATE FILTER for comprehensive database
@@ -28,10 +261,16 @@ class RecommendationEngine:
             
             if tmdb_service.enabled:
                 print("🎬 Getting comprehensive movie database from TMDB...")
-                tmdb_movies = tmdb_service.generate_comprehensive_database(3000)  # All movies
-                if tmdb_movies:
-                    all_movies.extend(tmdb_movies)
-                    print(f"✅ TMDB: {len(tmdb_movies)} movies")
+                pages = tmdb_service.stream_comprehensive_database(3000)  # All movies
+                while True:
+                    with self.progress.stage('tmdb_fetch'):
+                        page = next(pages, None)
+                    if page is None:
+                        break
+                    batch = unique(page)
+                    if batch:
+                        yield batch
+                print(f"✅ TMDB: {count} movies")
             
             # Add Groq movies for more variety
             from services.groq_service import GroqService
@@ -39,33 +278,70 @@ class RecommendationEngine:
             
             if groq_service.enabled:
                 print("🤖 Getting movies from Groq...")
-                groq_movies = groq_service.generate_movie_database(3000)
+                with self.progress.stage('groq_fetch'):
+                    groq_movies = groq_service.generate_movie_database(3000)
                 if groq_movies:
-                    all_movies.extend(groq_movies)
                     print(f"✅ Groq: {len(groq_movies)} movies")
-            
-            # Deduplicate by title
-            if all_movies:
-                seen_titles = set()
-                unique_movies = []
-                for movie in all_movies:
-                    title_key = movie['title'].lower().strip()
-                    if title_key not in seen_titles:
-                        seen_titles.add(title_key)
-                        movie['id'] = len(unique_movies) + 1
-                        unique_movies.append(movie)
-                
-                self.movies_df = pd.DataFrame(unique_movies)
-                print(f"🎯 Total unique movies for search/recommendations: {len(self.movies_df)}")
-                return
-            
-            # Fallback to sample if needed
-            print("⚠️ No movies from APIs, using sample dataset")
-            self.create_sample_dataset()
-            
+                    batch = unique(groq_movies)
+                    if batch:
+                        yield batch
+        
         except Exception as e:
             print(f"❌ Error loading data: {e}")
-            self.create_sample_dataset()
+    
+    def stream_train(
+        self,
+        initial_movies: Optional[int] = None,
+        batch_movies: Optional[int] = None,
+        on_publish: Optional[Callable[[], None]] = None
+    ) -> int:
+        """
+        Cold start: serve a partial model while the catalog is still streaming in.
+        
+        A model is trained and published as soon as `initial_movies` have
+        arrived, then grown with add_movies every `batch_movies`. Once the
+        stream ends the model is retrained on the full catalog, since the
+        vocabulary and IDF weights were fitted on the first movies only.
+        `on_publish` is called after every published update. Returns the
+        final catalog size.
+        """
+        initial_movies = initial_movies or int(os.getenv('STREAM_INITIAL_MOVIES', '300'))
+        batch_movies = batch_movies or int(os.getenv('STREAM_BATCH_MOVIES', '200'))
+        
+        def published():
+            if on_publish is not None:
+                on_publish()
+        
+        with self.progress.run():
+            pending = []
+            trained = False
+            for batch in self._stream_movies():
+                pending.extend(batch)
+                if not trained and len(pending) >= initial_movies:
+                    with self._staged():
+                        self.movies_df = pd.DataFrame(pending)
+                        self.train_model()
+                    print(f"⚡ Serving a partial model ({len(pending)} movies) while the catalog loads")
+                    trained, pending = True, []
+                    published()
+                elif trained and len(pending) >= batch_movies:
+                    self.add_movies(pending)
+                    pending = []
+                    published()
+            
+            with self._staged():
+                if not trained:
+                    if pending:
+                        self.movies_df = pd.DataFrame(pending)
+                    else:
+                        print("⚠️ No movies from APIs, using sample dataset")
+                        self.create_sample_dataset()
+                elif pending:
+                    self.movies_df = pd.concat([self.movies_df, pd.DataFrame(pending)], ignore_index=True)
+                print(f"🎯 Total unique movies for search/recommendations: {len(self.movies_df)}")
+                self.train_model()
+            published()
+        return len(self.catalog)
     
     def get_latest_movies(self, limit: int = 100) -> List[Dict]:
         """Get latest movies from last 30 days only (separate from main database)"""
@@ -97,114 +373,529 @@ class RecommendationEngine:
         ]
         
         self.movies_df = pd.DataFrame(sample_movies)
+        # Marks a fallback catalog that must never be persisted as the current model
+        self.movies_df.attrs['sample'] = True
         print(f"✓ Loaded {len(sample_movies)} sample movies for search/recommendations")
     
+    @_publishes_snapshot
     def train_model(self):
         """Train the recommendation model using TF-IDF and cosine similarity"""
         if self.movies_df is None:
             raise Exception("Data not loaded. Call load_data() first.")
         
-        # Create combined features for content-based filtering
-        self.movies_df['combined_features'] = (
-            self.movies_df['genres'].fillna('') + ' ' +
-            self.movies_df['description'].fillna('') + ' ' +
-            self.movies_df['title'].fillna('')
+        # Create combined features for content-based filtering (not kept on the
+        # DataFrame, it would duplicate every description in memory)
+        combined_features = self._combined_features(self.movies_df)
+        
+        with self.progress.stage('vectorize'):
+            # Create TF-IDF matrix
+            self.tfidf_vectorizer = TfidfVectorizer(
+                stop_words='english',
+                ngram_range=(1, 2),
+                max_features=5000
+            )
+            
+            self.tfidf_matrix = self.tfidf_vectorizer.fit_transform(combined_features)
+            
+            # LSA replaces the sparse rows with dense embeddings for all similarity work
+            if self.vector_space == 'lsa':
+                self.lsa = LSAProjection.fit(self.tfidf_matrix, n_components=self.lsa_dimensions)
+                self.item_vectors = self.lsa.transform(self.tfidf_matrix)
+                self.tfidf_matrix = None
+            else:
+                self.lsa = None
+                self.item_vectors = self.tfidf_matrix
+        
+        with self.progress.stage('index_build'):
+            self._build_similarity_backend()
+            self._build_indexes()
+        
+        # Precompute the top-K distinct-title neighbours of every movie
+        build_start = datetime.now()
+        with self.progress.stage('neighbor_table'):
+            self.neighbor_ids, self.neighbor_scores = build_neighbor_table(
+                self.item_vectors,
+                k=self.neighbor_k,
+                group_codes=self.title_codes,
+                block_size=self.neighbor_block_size,
+                chunk_size=self.similarity_chunk_size,
+                search=self.ann_index.query if self.ann_index is not None else None,
+                workers=self.neighbor_workers,
+                progress=self._neighbor_progress()
+            )
+        print(f"✓ Neighbour table built in {(datetime.now() - build_start).total_seconds():.1f}s "
+              f"({self.neighbor_workers} workers)")
+        
+        self.model_version = self._new_version()
+        print(f"Model trained successfully ({self.similarity_mode} similarity over {self._vector_description()}, "
+              f"{self.neighbor_k} neighbours per movie, version {self.model_version})")
+    
+    def _neighbor_progress(self):
+        """Progress callback that prints roughly every 10% of the neighbour table build"""
+        last_reported = [0]
+        
+        def report(done: int, total: int):
+            percent = done * 100 // max(total, 1)
+            if percent >= last_reported[0] + 10 or done == total:
+                last_reported[0] = percent
+                print(f"🔧 Neighbour table: {percent}% ({done}/{total} movies)")
+        
+        return report
+    
+    def _build_similarity_backend(self):
+        """Derive the mode-specific structures from the item vectors"""
+        # Dense mode precomputes the full N x N matrix; sparse mode never builds it
+        if self.similarity_mode == 'dense':
+            self.cosine_sim = cosine_similarity(self.item_vectors, self.item_vectors)
+        else:
+            self.cosine_sim = None
+        
+        # LSH mode answers neighbour queries from buckets instead of a full scan
+        if self.similarity_mode == 'lsh':
+            self.ann_index = LSHIndex(**self.lsh_params).fit(self.item_vectors)
+        else:
+            self.ann_index = None
+    
+    def _vector_description(self) -> str:
+        if self.lsa is not None:
+            return f"{self.lsa.dimensions}-dim LSA embeddings"
+        return "TF-IDF vectors"
+    
+    def _embed(self, tfidf_rows):
+        """Item vectors for TF-IDF rows in the model's vector space"""
+        if self.lsa is not None:
+            return self.lsa.transform(tfidf_rows)
+        return tfidf_rows
+    
+    def _new_version(self) -> str:
+        """Identifier for a newly trained or updated model"""
+        return datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+    
+    @_reads_snapshot
+    def save_model(self) -> Optional[str]:
+        """
+        Persist the trained model as a new artifact version.
+        
+        Models trained on the sample fallback are not saved (returns None):
+        a fresh artifact would be served on every restart without a retrain.
+        """
+        if self.movies_df is not None and self.movies_df.attrs.get('sample'):
+            print("⚠️ Not saving model artifacts for the sample dataset")
+            return None
+        return self.artifact_store.save(self, version=self.model_version)
+    
+    @_publishes_snapshot
+    def load_model(self, version: Optional[str] = None) -> bool:
+        """
+        Load persisted model artifacts (the current version by default).
+        
+        Arrays are memory-mapped and no network calls are made, so a warm
+        restart is ready almost immediately. Returns False when no usable
+        artifact exists.
+        """
+        try:
+            artifacts = self.artifact_store.load(version)
+        except Exception as e:
+            print(f"❌ Error loading model artifacts: {e}")
+            return False
+        
+        if not artifacts:
+            return False
+        
+        self.movies_df = artifacts['movies_df']
+        self.tfidf_vectorizer = artifacts['vectorizer']
+        self.tfidf_matrix = artifacts['tfidf_matrix']
+        self.lsa = LSAProjection(artifacts['lsa_components']) if artifacts['lsa_components'] is not None else None
+        self.item_vectors = artifacts['item_vectors']
+        self.vector_space = 'lsa' if self.lsa is not None else 'tfidf'
+        self.neighbor_ids = artifacts['neighbor_ids']
+        self.neighbor_scores = artifacts['neighbor_scores']
+        self.neighbor_k = int(self.neighbor_ids.shape[1])
+        self.model_version = artifacts['manifest']['version']
+        
+        # Mode-specific structures are cheap to derive from the stored vectors
+        self._build_similarity_backend()
+        self._build_indexes()
+        
+        print(f"✓ Loaded model artifacts version {self.model_version} "
+              f"({len(self.movies_df)} movies, {self._vector_description()})")
+        return True
+    
+    def artifact_age_hours(self) -> Optional[float]:
+        """Age of the current persisted artifact in hours, None if there is none"""
+        manifest = self.artifact_store.read_manifest()
+        if not manifest:
+            return None
+        created_at = datetime.fromisoformat(manifest['created_at'])
+        return (datetime.now() - created_at).total_seconds() / 3600
+    
+    def _combined_features(self, df: pd.DataFrame) -> pd.Series:
+        """Text used for content-based filtering"""
+        return (
+            df['genres'].fillna('') + ' ' +
+            df['description'].fillna('') + ' ' +
+            df['title'].fillna('')
         )
+    
+    def _build_indexes(self):
+        """Rebuild the catalog and lookup structures derived from movies_df"""
+        self.catalog = MovieCatalog(self.movies_df)
+        catalog = self.catalog
+        titles = catalog.titles.tolist()
+        
+        self.title_codes = pd.factorize(
+            pd.Series(titles).str.lower().str.strip()
+        )[0].astype(np.int32)
+        
+        # O(1) lookups by primary key and normalized title
+        self.id_index = {}
+        for row, movie_id in enumerate(catalog.ids.tolist()):
+            self.id_index.setdefault(movie_id, row)
+        self.title_index = TitleIndex(titles)
         
-        # Create TF-IDF matrix
-        self.tfidf_vectorizer = TfidfVectorizer(
-            stop_words='english',
-            ngram_range=(1, 2),
-            max_features=5000
+        # Full-text search over title, genres and description
+        self.search_index = SearchIndex(
+            fields={
+                'title': titles,
+                'genres': catalog.genres(np.arange(len(catalog))).tolist(),
+                'description': catalog.descriptions.tolist(),
+            },
+            ratings=catalog.ratings
         )
         
-        self.tfidf_matrix = self.tfidf_vectorizer.fit_transform(
-            self.movies_df['combined_features']
+        # Title autocomplete, pre-ranked by rating and popularity
+        self.prefix_index = PrefixIndex(titles, rank=self._popularity_rank())
+        
+        # Per-movie rating, popularity and recency components for hybrid re-ranking
+        self.ranker = HybridRanker(catalog)
+    
+    def _popularity_rank(self) -> np.ndarray:
+        """Static per-movie rank blending rating with log popularity"""
+        log_popularity = np.log1p(np.maximum(self.catalog.popularity, 0))
+        max_log_popularity = max(float(log_popularity.max()), 1e-9) if len(log_popularity) else 1.0
+        return 0.7 * self.catalog.ratings / 10 + 0.3 * log_popularity / max_log_popularity
+    
+    def _search_neighbors(self, vectors, count: int) -> tuple:
+        """Top-`count` (indices, scores) for each query row with the configured backend"""
+        if self.ann_index is not None:
+            return self.ann_index.query(vectors, count)
+        return top_k_similar(vectors, self.item_vectors, count, chunk_size=self.similarity_chunk_size)
+    
+    @_publishes_snapshot
+    def add_movies(self, movies: List[Dict]) -> int:
+        """
+        Fold new movies into the trained model without a full retrain.
+        
+        The fitted vocabulary and IDF weights are reused as-is, so only the new
+        rows are vectorised. New movies get their own neighbour lists and existing
+        lists are only touched where a new movie beats their current K-th score.
+        Returns the number of movies added (movies whose normalized title and
+        year are already present are skipped).
+        """
+        if self.tfidf_vectorizer is None:
+            raise Exception("Model not trained. Call train_model() first.")
+        
+        seen_keys = {
+            dedup_key({'title': title, 'year': year})
+            for title, year in zip(self.catalog.titles.tolist(), self.catalog.years.tolist())
+        }
+        next_id = int(self.movies_df['id'].max()) + 1 if len(self.movies_df) > 0 else 1
+        new_movies = []
+        for movie in movies:
+            key = dedup_key(movie)
+            if not key[0] or key in seen_keys:
+                continue
+            seen_keys.add(key)
+            movie = dict(movie)
+            movie['id'] = next_id + len(new_movies)
+            movie['genres'] = canonicalize_genres(movie.get('genres'))
+            new_movies.append(movie)
+        
+        if not new_movies:
+            return 0
+        
+        new_df = pd.DataFrame(new_movies)
+        with self.progress.stage('vectorize'):
+            new_rows = self._embed(self.tfidf_vectorizer.transform(self._combined_features(new_df)))
+        
+        start = len(self.movies_df)
+        self.movies_df = pd.concat([self.movies_df, new_df], ignore_index=True)
+        if self.lsa is not None:
+            self.item_vectors = np.vstack([self.item_vectors, new_rows])
+        else:
+            self.tfidf_matrix = sparse.vstack([self.tfidf_matrix, new_rows], format='csr')
+            self.item_vectors = self.tfidf_matrix
+        total = len(self.movies_df)
+        
+        with self.progress.stage('index_build'):
+            if self.cosine_sim is not None:
+                cross = cosine_similarity(self.item_vectors, new_rows)
+                self.cosine_sim = np.block([
+                    [self.cosine_sim, cross[:start]],
+                    [cross[:start].T, cross[start:]]
+                ])
+            if self.ann_index is not None:
+                self.ann_index = copy.copy(self.ann_index).extend(self.item_vectors)
+            
+            self._build_indexes()
+        
+        with self.progress.stage('neighbor_table'):
+            # Neighbour lists for the new movies
+            new_row_ids = np.arange(start, total)
+            indices, scores = self._search_neighbors(new_rows, min(total, 2 * self.neighbor_k + 1))
+            new_ids, new_scores = dedupe_neighbors(new_row_ids, indices, scores, self.title_codes, self.neighbor_k)
+            
+            # Existing movies whose lists the new movies break into (merged into the
+            # grown copies, the published table is never written to)
+            kth_scores = np.where(self.neighbor_ids[:, -1] >= 0, self.neighbor_scores[:, -1], -np.inf)
+            neighbor_ids = np.concatenate([self.neighbor_ids, new_ids])
+            neighbor_scores = np.concatenate([self.neighbor_scores, new_scores])
+            for block_start in range(0, start, self.similarity_chunk_size):
+                block_end = min(block_start + self.similarity_chunk_size, start)
+                cross = dot_block(self.item_vectors[block_start:block_end], new_rows)
+                affected = np.flatnonzero(cross.max(axis=1) > kth_scores[block_start:block_end]) + block_start
+                if len(affected) == 0:
+                    continue
+                cand_ids = np.broadcast_to(new_row_ids.astype(np.int32), (len(affected), len(new_row_ids)))
+                neighbor_ids[affected], neighbor_scores[affected] = merge_neighbor_candidates(
+                    affected,
+                    neighbor_ids[affected],
+                    neighbor_scores[affected],
+                    cand_ids,
+                    cross[affected - block_start],
+                    self.title_codes,
+                    self.neighbor_k
+                )
+        
+        self.neighbor_ids = neighbor_ids
+        self.neighbor_scores = neighbor_scores
+        self.model_version = self._new_version()
+        
+        print(f"✓ Added {len(new_movies)} movies incrementally (total: {total})")
+        return len(new_movies)
+    
+    @_publishes_snapshot
+    def remove_movies(self, movie_ids: List[int]) -> int:
+        """
+        Remove movies from the trained model without a full retrain.
+        
+        Rows are dropped and renumbered; only the neighbour lists that pointed
+        at a removed movie are recomputed. Returns the number of movies removed.
+        """
+        if self.tfidf_vectorizer is None:
+            raise Exception("Model not trained. Call train_model() first.")
+        
+        remove_mask = self.movies_df['id'].isin({int(movie_id) for movie_id in movie_ids}).to_numpy()
+        if not remove_mask.any():
+            return 0
+        
+        keep = ~remove_mask
+        keep_rows = np.flatnonzero(keep)
+        old_to_new = np.full(len(keep), -1, dtype=np.int32)
+        old_to_new[keep_rows] = np.arange(len(keep_rows), dtype=np.int32)
+        
+        self.movies_df = self.movies_df.iloc[keep_rows].reset_index(drop=True)
+        self.item_vectors = self.item_vectors[keep_rows]
+        if self.lsa is None:
+            self.tfidf_matrix = self.item_vectors
+        if self.cosine_sim is not None:
+            self.cosine_sim = self.cosine_sim[np.ix_(keep_rows, keep_rows)]
+        if self.ann_index is not None:
+            self.ann_index = copy.copy(self.ann_index).remap(self.item_vectors, old_to_new)
+        
+        self._build_indexes()
+        
+        # Renumber surviving neighbours and repair the lists that lost an entry
+        neighbor_ids = self.neighbor_ids[keep_rows]
+        mapped = np.where(neighbor_ids >= 0, old_to_new[np.maximum(neighbor_ids, 0)], -1)
+        damaged = np.flatnonzero(((neighbor_ids >= 0) & (mapped < 0)).any(axis=1))
+        self.neighbor_ids = mapped.astype(np.int32)
+        self.neighbor_scores = np.where(mapped >= 0, self.neighbor_scores[keep_rows], 0.0).astype(np.float32)
+        
+        if len(damaged) > 0:
+            total = len(self.movies_df)
+            indices, scores = self._search_neighbors(
+                self.item_vectors[damaged], min(total, 2 * self.neighbor_k + 1)
+            )
+            self.neighbor_ids[damaged], self.neighbor_scores[damaged] = dedupe_neighbors(
+                damaged, indices, scores, self.title_codes, self.neighbor_k
+            )
+        
+        self.model_version = self._new_version()
+        removed = int(remove_mask.sum())
+        print(f"✓ Removed {removed} movies incrementally (total: {len(self.movies_df)})")
+        return removed
+    
+    def ingest_latest_movies(self, limit: int = 100) -> int:
+        """Fold the latest TMDB releases into the trained model"""
+        return self.add_movies(self.get_latest_movies(limit))
+    
+    def _similar_movies(self, movie_idx: int, count: int) -> List[tuple]:
+        """Get the `count` most similar (index, score) pairs for a movie, best first"""
+        if self.cosine_sim is not None:
+            row = self.cosine_sim[movie_idx]
+            count = min(count, len(row))
+            top = np.argpartition(-row, count - 1)[:count]
+            top = top[np.argsort(-row[top], kind='stable')]
+            return [(int(idx), float(row[idx])) for idx in top]
+        
+        indices, scores = self._search_neighbors(
+            self.item_vectors[movie_idx:movie_idx + 1],
+            min(count, self.item_vectors.shape[0])
         )
+        return [(int(idx), float(score)) for idx, score in zip(indices[0], scores[0]) if idx >= 0]
+    
+    def _get_neighbors(self, movie_idx: int, count: int) -> List[tuple]:
+        """Get up to `count` distinct-title neighbours of a movie as (index, score) pairs"""
+        if self.neighbor_ids is not None:
+            row_ids = self.neighbor_ids[movie_idx, :count]
+            valid = row_ids >= 0
+            # The table row is exhaustive unless it was cut short by duplicate titles
+            if valid.sum() == count or valid.sum() >= len(self.catalog) - 1:
+                row_scores = self.neighbor_scores[movie_idx, :count]
+                return list(zip(row_ids[valid].tolist(), row_scores[valid].tolist()))
         
-        # Calculate cosine similarity matrix
-        self.cosine_sim = cosine_similarity(self.tfidf_matrix, self.tfidf_matrix)
+        # Fall back to scanning similarities when the table cannot cover the request
+        total_movies = len(self.catalog)
+        fetch_count = min(total_movies, (count + 1) * 4)
+        sim_scores = self._similar_movies(movie_idx, fetch_count)
         
-        print("Model trained successfully")
+        ids = self.catalog.ids
+        neighbors = []
+        seen_ids = {int(ids[movie_idx])}
+        seen_titles = {int(self.title_codes[movie_idx])}
+        
+        position = 0
+        while len(neighbors) < count:
+            if position >= len(sim_scores):
+                # Too many duplicates in the window, widen it
+                if fetch_count >= total_movies:
+                    break
+                fetch_count = min(total_movies, fetch_count * 2)
+                sim_scores = self._similar_movies(movie_idx, fetch_count)
+                continue
+            
+            idx, score = sim_scores[position]
+            position += 1
+            
+            movie_id = int(ids[idx])
+            title_key = int(self.title_codes[idx])
+            
+            # Skip if we've already added this movie by ID or title
+            if movie_id in seen_ids or title_key in seen_titles:
+                continue
+            
+            seen_ids.add(movie_id)
+            seen_titles.add(title_key)
+            neighbors.append((idx, score))
+        
+        return neighbors
     
+    @_reads_snapshot
     def get_movie_index(self, title: str) -> Optional[int]:
-        """Get the index of a movie by title"""
-        matches = self.movies_df[
-            self.movies_df['title'].str.lower() == title.lower()
-        ]
-        if len(matches) > 0:
-            return matches.index[0]
-        return None
+        """Get the index of a movie by title (exact normalized match, then fuzzy)"""
+        if self.title_index is None:
+            return None
+        return self.title_index.lookup(title)
     
+    @_reads_snapshot
     def get_all_movies(self, limit: int = 100, search: Optional[str] = None) -> List[MovieResponse]:
         """Get all movies without date filtering (for onboarding and search)"""
-        if self.movies_df is None:
-            return []
-
-        filtered_df = self.movies_df.copy()
-
-        # Apply search filter if provided
-        if search:
-            search_lower = search.lower()
-            search_condition = (
-                filtered_df['title'].str.lower().str.contains(search_lower, na=False) |
-                filtered_df['genres'].str.lower().str.contains(search_lower, na=False)
-            )
-            filtered_df = filtered_df.loc[search_condition]
-
-        # Sort by rating (highest first)
-        filtered_df = filtered_df.sort_values(by=['rating'], ascending=[False])
-
-        movies = []
-        for _, movie in filtered_df.head(limit).iterrows():
-            movies.append(MovieResponse(
-                id=int(movie['id']),
-                title=movie['title'],
-                genres=movie['genres'],
-                description=movie['description'],
-                rating=float(movie['rating']),
-                year=int(movie['year']),
-                release_month=int(movie['release_month']) if pd.notna(movie['release_month']) else None
-            ))
-
-        return movies
-
+        # Presorted by rating (highest first), or BM25-ranked when searching
+        return self.list_movies('rating', limit=limit, search=search)[0]
+    
+    @_reads_snapshot
     def get_movies(self, limit: int = 100, search: Optional[str] = None) -> List[MovieResponse]:
         """Get all movies from comprehensive database (for search and recommendations)"""
-        if self.movies_df is None or len(self.movies_df) == 0:
+        # Presorted by rating, then year (newest first), or BM25-ranked when searching
+        return self.list_movies('rating_year', limit=limit, search=search)[0]
+    
+    @_reads_snapshot
+    def list_movies(
+        self,
+        listing: str,
+        limit: int = 100,
+        search: Optional[str] = None,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[MovieResponse], Optional[str]]:
+        """
+        One page of a catalog listing and the cursor of the next page.
+        
+        `listing` is one of LISTING_ORDERS. Pages are slices of a presorted (or
+        cached search) order, so only the page's movies are materialised.
+        Cursors are tied to the model version; a stale or foreign cursor raises
+        CursorError. The next cursor is None on the last page.
+        """
+        rows, next_cursor = self._listing_page(listing, limit, search, cursor)
+        if self.catalog is None:
+            return [], None
+        return self.catalog.to_responses(rows), next_cursor
+    
+    @_reads_snapshot
+    def list_movies_json(
+        self,
+        listing: str,
+        limit: int = 100,
+        search: Optional[str] = None,
+        cursor: Optional[str] = None
+    ) -> Tuple[bytes, Optional[str]]:
+        """Same page as list_movies, as a JSON array joined from cached per-movie JSON"""
+        rows, next_cursor = self._listing_page(listing, limit, search, cursor)
+        if self.catalog is None:
+            return b'[]', None
+        return self.catalog.to_json(rows), next_cursor
+    
+    def _listing_page(
+        self,
+        listing: str,
+        limit: int,
+        search: Optional[str],
+        cursor: Optional[str]
+    ) -> Tuple[np.ndarray, Optional[str]]:
+        """Rows of one listing page and the cursor of the next page"""
+        if listing not in LISTING_ORDERS:
+            raise ValueError(f"Unknown listing '{listing}', expected one of {tuple(LISTING_ORDERS)}")
+        if self.catalog is None or len(self.catalog) == 0:
+            return np.empty(0, dtype=np.int32), None
+        
+        offset = decode_cursor(cursor, self.model_version, listing, search) if cursor else 0
+        rows = self._listing_rows(listing, search)
+        page = rows[offset:offset + max(limit, 0)]
+        
+        end = offset + len(page)
+        # An empty page never hands out a cursor, so following cursors always terminates
+        next_cursor = encode_cursor(self.model_version, listing, search, end) if offset < end < len(rows) else None
+        return page, next_cursor
+    
+    def _listing_rows(self, listing: str, search: Optional[str]) -> np.ndarray:
+        """Complete row order of a listing"""
+        if not search:
+            return getattr(self.catalog, LISTING_ORDERS[listing])
+        
+        # BM25-ranked full-text search with a rating tiebreak (same for every listing)
+        key = (self.model_version, search)
+        with self._listing_lock:
+            rows = self._listing_cache.get(key)
+            if rows is not None:
+                self._listing_cache.move_to_end(key)
+                return rows
+        
+        rows = self.search_index.search(search)
+        with self._listing_lock:
+            self._listing_cache[key] = rows
+            while len(self._listing_cache) > self.listing_cache_size:
+                self._listing_cache.popitem(last=False)
+        return rows
+    
+    @_reads_snapshot
+    def autocomplete(self, prefix: str, limit: int = 10) -> List[MovieResponse]:
+        """Titles starting with the prefix (or with a word starting with it), best ranked first"""
+        if self.prefix_index is None:
             return []
 
-        df = self.movies_df.copy()
-
-        # Apply search filter if provided
-        if search:
-            search_lower = search.lower()
-            search_condition = (
-                df['title'].str.lower().str.contains(search_lower, na=False) |
-                df['genres'].str.lower().str.contains(search_lower, na=False)
-            )
-            df = df.loc[search_condition]
-
-        # Sort by popularity/rating
-        df = df.sort_values(
-            by=['rating', 'year'],
-            ascending=[False, False]
-        )
-
-        movies = []
-        for _, movie in df.head(limit).iterrows():
-            movies.append(MovieResponse(
-                id=int(movie['id']),
-                title=movie['title'],
-                genres=movie['genres'],
-                description=movie['description'],
-                rating=float(movie['rating']),
-                year=int(movie['year']),
-                release_month=int(movie['release_month']) if pd.notna(movie['release_month']) else None
-            ))
-
-        return movies
+        return self.catalog.to_responses(self.prefix_index.complete(prefix, limit=limit))
     
+    @_reads_snapshot
     def search_by_preferences(
         self,
         favorite_genres: List[str],
@@ -213,99 +904,165 @@ class RecommendationEngine:
         limit: int = 20
     ) -> List[Dict]:
         """Search movies that match user preferences with flexible matching"""
-        if self.movies_df is None:
+        if self.catalog is None:
             return []
         
-        filtered_df = self.movies_df.copy()
+        catalog = self.catalog
+        selected = np.ones(len(catalog), dtype=bool)
         
         # Start with genre filtering if specified
         if favorite_genres:
-            genre_pattern = '|'.join(favorite_genres)
-            genre_matches = filtered_df[
-                filtered_df['genres'].str.contains(genre_pattern, case=False, na=False)
-            ]
+            # Canonical genres are a single bitwise test over the mask column
+            preference_mask = genre_mask(favorite_genres)
+            genre_matches = (catalog.genre_masks & np.uint32(preference_mask)) != 0
+            
+            # Other names are matched against the distinct genre strings and mapped through the codes
+            other_genres = [g for g in split_genres(favorite_genres) if canonical_genre(g) is None]
+            if other_genres:
+                genre_pattern = '|'.join(re.escape(g) for g in other_genres)
+                value_matches = pd.Series(catalog.genre_values).str.contains(
+                    genre_pattern, case=False, na=False
+                ).to_numpy()
+                genre_matches |= value_matches[catalog.genre_codes]
             
             # If we have genre matches, use them
-            if len(genre_matches) > 0:
-                filtered_df = genre_matches
+            if genre_matches.any():
+                selected &= genre_matches
             else:
                 # If no exact genre matches, be more flexible
                 print(f"No exact matches for {favorite_genres}, showing related movies")
         
         # Apply rating filter with flexibility
-        exact_rating_matches = filtered_df[filtered_df['rating'] >= min_rating]
-        if len(exact_rating_matches) >= 5:
-            filtered_df = exact_rating_matches
+        exact_rating_matches = selected & (catalog.ratings >= min_rating)
+        if exact_rating_matches.sum() >= 5:
+            selected = exact_rating_matches
         else:
             # If too few high-rated matches, lower the threshold slightly
             relaxed_rating = max(min_rating - 1.0, 5.0)
-            filtered_df = filtered_df[filtered_df['rating'] >= relaxed_rating]
+            selected &= catalog.ratings >= relaxed_rating
             print(f"Relaxed rating from {min_rating} to {relaxed_rating} for more results")
         
         # Apply decade filter with flexibility
         decade_start = preferred_decade - 5
         decade_end = preferred_decade + 14
-        decade_matches = filtered_df[
-            (filtered_df['year'] >= decade_start) & (filtered_df['year'] <= decade_end)
-        ]
+        decade_matches = selected & (catalog.years >= decade_start) & (catalog.years <= decade_end)
         
-        if len(decade_matches) >= 3:
-            filtered_df = decade_matches
+        if decade_matches.sum() >= 3:
+            selected = decade_matches
         else:
             # If too few decade matches, expand the range
             expanded_start = preferred_decade - 15
             expanded_end = preferred_decade + 25
-            filtered_df = filtered_df[
-                (filtered_df['year'] >= expanded_start) & (filtered_df['year'] <= expanded_end)
-            ]
+            selected &= (catalog.years >= expanded_start) & (catalog.years <= expanded_end)
             print(f"Expanded decade range for more results")
         
-        # Sort by rating (highest first) and then by year (newest first)
-        filtered_df = filtered_df.sort_values(
-            by=['rating', 'year'], 
-            ascending=[False, False]
-        )
+        # Presorted by rating (highest first) and then by year (newest first)
+        order = catalog.by_rating_year
+        rows = order[selected[order]][:limit]
         
-        movies = []
-        for _, movie in filtered_df.head(limit).iterrows():
-            movies.append({
-                'id': int(movie['id']),
-                'title': movie['title'],
-                'genres': movie['genres'],
-                'description': movie['description'],
-                'rating': float(movie['rating']),
-                'year': int(movie['year']),
-                'release_month': int(movie['release_month']) if pd.notna(movie['release_month']) else None,
-                'mass_rating': round(float(movie['rating']) * 0.9, 1),
-                'cinephile_rating': round(min(float(movie['rating']) * 1.1, 9.0), 1)
-            })
+        movies = catalog.to_dicts(rows)
+        for movie in movies:
+            movie['mass_rating'] = round(movie['rating'] * 0.9, 1)
+            movie['cinephile_rating'] = round(min(movie['rating'] * 1.1, 9.0), 1)
         
         return movies
     
+    @_reads_snapshot
+    def score_preferences(self, preferences: Dict) -> tuple:
+        """
+        Preference confidence (0-100) and should-watch flag for every movie.
+        
+        Vectorized form of `_analyze_preferences`: the same genre, rating and
+        decade rules are evaluated as NumPy operations over the catalog arrays.
+        """
+        catalog = self.catalog
+        score = np.zeros(len(catalog), dtype=np.float64)
+        max_score = 0
+        
+        if 'favorite_genres' in preferences and preferences['favorite_genres']:
+            max_score += 30
+            names = split_genres(preferences['favorite_genres'])
+            user_mask = genre_mask(names)
+            overlap = popcount(catalog.genre_masks & np.uint32(user_mask))
+            
+            other_genres = {g.lower() for g in names if canonical_genre(g) is None}
+            if other_genres:
+                value_counts = np.array([
+                    len({g.lower() for g in split_genres(value)} & other_genres)
+                    for value in catalog.genre_values
+                ], dtype=np.int32)
+                overlap = overlap + value_counts[catalog.genre_codes]
+            
+            user_genre_count = len(mask_to_genres(user_mask)) + len(other_genres)
+            score += np.where(
+                overlap > 0,
+                overlap / max(user_genre_count, 1) * 30,
+                np.where(catalog.ratings >= 8.0, 10, 0)
+            )
+        
+        if 'min_rating' in preferences:
+            max_score += 50
+            min_rating = preferences['min_rating']
+            score += np.where(
+                catalog.ratings >= min_rating,
+                50,
+                np.where(min_rating - catalog.ratings <= 1.0, 25, 0)
+            )
+        
+        if 'preferred_decade' in preferences:
+            max_score += 20
+            preferred_decade = preferences['preferred_decade']
+            movie_decades = (catalog.years // 10) * 10
+            score += np.where(
+                movie_decades == preferred_decade,
+                20,
+                np.where(np.abs(catalog.years - preferred_decade) <= 10, 10, 0)
+            )
+        
+        if max_score > 0:
+            confidence = score / max_score * 100
+        else:
+            confidence = np.full(len(catalog), 50.0)
+        return np.round(confidence, 2), confidence >= 50
+    
+    @_reads_snapshot
+    def rank_for_preferences(self, preferences: Dict, limit: int = 20) -> List[MovieResponse]:
+        """Top movies to watch for a preference dict, highest confidence first"""
+        if self.catalog is None:
+            return []
+        
+        confidence, should_watch = self.score_preferences(preferences)
+        
+        # Stable sort keeps rating-then-year order among equal confidences
+        order = self.catalog.by_rating_year
+        order = order[should_watch[order]]
+        rows = order[np.argsort(-confidence[order], kind='stable')][:limit]
+        
+        movies = []
+        for row in rows:
+            _, movie_confidence, reason = self._analyze_preferences(int(row), preferences)
+            movies.append(self.catalog.to_response(int(row), reason=reason, confidence=movie_confidence))
+        return movies
+    
+    @_reads_snapshot
     def get_movie_by_id(self, movie_id: int) -> Optional[MovieResponse]:
         """Get a specific movie by ID"""
-        if self.movies_df is None:
+        if self.catalog is None:
             return None
 
-        matches = self.movies_df[self.movies_df['id'] == movie_id]
-        if len(matches) > 0:
-            movie = matches.iloc[0]
-            return MovieResponse(
-                id=int(movie['id']),
-                title=movie['title'],
-                genres=movie['genres'],
-                description=movie['description'],
-                rating=float(movie['rating']),
-                year=int(movie['year']),
-                release_month=int(movie['release_month']) if pd.notna(movie['release_month']) else None
-            )
+        row = self.id_index.get(int(movie_id))
+        if row is not None:
+            return self.catalog.to_response(row)
         return None
     
+    @_reads_snapshot
     def recommend(
         self,
         movie_title: str,
         user_preferences: Dict,
-        num_recommendations: int = 5
+        num_recommendations: int = 5,
+        ranking_weights: Optional[Dict[str, float]] = None,
+        diversity: float = 0.0
     ) -> RecommendationResponse:
         """
         Generate recommendations based on movie title and user preferences
@@ -313,67 +1070,245 @@ class RecommendationEngine:
         movie_idx = self.get_movie_index(movie_title)
         
         if movie_idx is None:
-            return RecommendationResponse(
-                should_watch=False,
-                confidence=0.0,
-                reason=f"Movie '{movie_title}' not found in database",
-                recommended_movies=[],
-                target_movie=None
-            )
+            return self._not_found_response(movie_title)
         
-        # Get the target movie details
-        target_movie = self.movies_df.iloc[movie_idx]
+        # Get recommended movie indices (deduplicated by movie ID and title)
+        weights = self.ranker.weights(ranking_weights)
+        candidates = self._get_neighbors(movie_idx, self._candidate_count(num_recommendations, weights, diversity))
+        neighbors = self._rerank_neighbors(candidates, weights, num_recommendations, diversity)
+        return self._build_recommendation(movie_idx, neighbors, user_preferences, enhance=True)
+    
+    @_reads_snapshot
+    def recommend_batch(
+        self,
+        movie_titles: List[str],
+        user_preferences: Dict,
+        num_recommendations: int = 5,
+        ranking_weights: Optional[Dict[str, float]] = None,
+        diversity: float = 0.0
+    ) -> List[RecommendationResponse]:
+        """
+        Recommendations for many titles at once, in request order.
         
-        # Get similarity scores
-        sim_scores = list(enumerate(self.cosine_sim[movie_idx]))
-        sim_scores = sorted(sim_scores, key=lambda x: x[1], reverse=True)
+        Titles are resolved once each and their neighbour lists are gathered
+        from the neighbour table in a single indexing operation. Reasons come
+        from the rule-based analysis only, without per-title AI enhancement.
+        """
+        rows = {title: self.get_movie_index(title) for title in dict.fromkeys(movie_titles)}
+        found = np.array(sorted({row for row in rows.values() if row is not None}), dtype=np.int64)
+        weights = self.ranker.weights(ranking_weights)
+        count = self._candidate_count(num_recommendations, weights, diversity)
         
-        # Get recommended movie indices (deduplicated by movie ID and title)
-        recommended_movies = []
-        seen_ids = {int(target_movie['id'])}  # Track seen IDs, exclude target movie
-        seen_titles = {target_movie['title'].lower().strip()}  # Track seen titles
+        neighbors = {}
+        if len(found) and self.neighbor_ids is not None:
+            table_ids = self.neighbor_ids[found, :count]
+            table_scores = self.neighbor_scores[found, :count]
+            valid = table_ids >= 0
+            counts = valid.sum(axis=1)
+            # Same coverage rule as _get_neighbors: the table row must be exhaustive
+            covered = (counts == count) | (counts >= len(self.catalog) - 1)
+            for position in np.flatnonzero(covered):
+                keep = valid[position]
+                neighbors[int(found[position])] = list(zip(
+                    table_ids[position][keep].tolist(),
+                    table_scores[position][keep].tolist()
+                ))
         
-        for idx, score in sim_scores[1:]:  # Skip first item (the movie itself)
-            if len(recommended_movies) >= num_recommendations:
-                break
-                
-            movie = self.movies_df.iloc[idx]
-            movie_id = int(movie['id'])
-            movie_title = movie['title'].lower().strip()
-            
-            # Skip if we've already added this movie by ID or title
-            if movie_id in seen_ids or movie_title in seen_titles:
+        results = {}
+        for title, movie_idx in rows.items():
+            if movie_idx is None:
+                results[title] = self._not_found_response(title)
                 continue
-                
-            seen_ids.add(movie_id)
-            seen_titles.add(movie_title)
-            
-            # Generate reason for this recommendation
-            reason = self._generate_recommendation_reason(
-                target_movie=target_movie,
-                recommended_movie=movie,
-                similarity_score=score
+            if movie_idx not in neighbors:
+                neighbors[movie_idx] = self._get_neighbors(movie_idx, count)
+            results[title] = self._build_recommendation(
+                movie_idx,
+                self._rerank_neighbors(neighbors[movie_idx], weights, num_recommendations, diversity),
+                user_preferences,
+                enhance=False
             )
-            
-            recommended_movies.append(MovieResponse(
-                id=movie_id,
-                title=movie['title'],
-                genres=movie['genres'],
-                description=movie['description'],
-                rating=float(movie['rating']),
-                year=int(movie['year']),
-                release_month=int(movie['release_month']) if pd.notna(movie['release_month']) else None,
-                reason=reason,
-                similarity_score=float(score)
-            ))
+        
+        return [results[title] for title in movie_titles]
+    
+    @_reads_snapshot
+    def resolve_seeds(
+        self,
+        movie_titles: Optional[List[str]] = None,
+        movie_ids: Optional[List] = None
+    ) -> List[Optional[int]]:
+        """Catalog rows of seed movies given by title and/or ID (None where unknown)"""
+        rows = [self.get_movie_index(title) for title in movie_titles or []]
+        for movie_id in movie_ids or []:
+            try:
+                rows.append(self.id_index.get(int(movie_id)))
+            except (TypeError, ValueError):
+                rows.append(None)
+        return rows
+    
+    @_reads_snapshot
+    def recommend_from_seeds(
+        self,
+        seed_rows: List[int],
+        weights: Optional[List[float]] = None,
+        num_recommendations: int = 10,
+        ranking_weights: Optional[Dict[str, float]] = None,
+        diversity: float = 0.0
+    ) -> List[MovieResponse]:
+        """
+        "More like these": neighbours of the weighted centroid of several movies.
+        
+        The seeds' item vectors are averaged with the given weights (uniform by
+        default) and L2-normalised, so one similarity query scores the whole
+        catalog against the set. Seeds and titles already returned are skipped,
+        and each result names the seed it is closest to.
+        """
+        if self.item_vectors is None or not seed_rows:
+            return []
+        return self.recommend_from_vector(
+            self.seed_centroid(seed_rows, weights), seed_rows, num_recommendations, ranking_weights, diversity
+        )
+    
+    @_reads_snapshot
+    def seed_centroid(self, seed_rows: List[int], weights: Optional[List[float]] = None):
+        """L2-normalised weighted mean of the seeds' item vectors (a single row)"""
+        seeds = np.asarray(seed_rows, dtype=np.int64)
+        weights = np.ones(len(seeds)) if weights is None else np.asarray(weights, dtype=np.float64)
+        if len(weights) != len(seeds):
+            raise ValueError("weights must have one entry per seed movie")
+        weights = np.clip(weights, 0, None)
+        if weights.sum() <= 0:
+            weights = np.ones(len(seeds))
+        
+        if self.lsa is not None:
+            centroid = (weights / weights.sum()).astype(np.float32) @ self.item_vectors[seeds]
+            norm = np.linalg.norm(centroid)
+            return (centroid / norm if norm > 0 else centroid)[None, :]
+        
+        centroid = sparse.csr_matrix(weights / weights.sum()) @ self.item_vectors[seeds]
+        norm = np.sqrt(centroid.multiply(centroid).sum())
+        if norm > 0:
+            centroid = centroid / norm
+        return sparse.csr_matrix(centroid)
+    
+    @_reads_snapshot
+    def recommend_from_vector(
+        self,
+        vector,
+        seed_rows: List[int],
+        num_recommendations: int = 10,
+        ranking_weights: Optional[Dict[str, float]] = None,
+        diversity: float = 0.0
+    ) -> List[MovieResponse]:
+        """Top movies for a query vector built from seed movies, excluding the seeds"""
+        if self.item_vectors is None or not seed_rows:
+            return []
+        
+        seeds = np.asarray(seed_rows, dtype=np.int64)
+        weights = self.ranker.weights(ranking_weights)
+        count = self._candidate_count(num_recommendations, weights, diversity)
+        excluded_titles = set(self.title_codes[seeds].tolist())
+        total_movies = len(self.catalog)
+        fetch_count = min(total_movies, 2 * count + len(seeds))
+        
+        while True:
+            indices, scores = self._search_neighbors(vector, fetch_count)
+            rows, row_scores, seen_titles = [], [], set(excluded_titles)
+            for idx, score in zip(indices[0].tolist(), scores[0].tolist()):
+                title_code = int(self.title_codes[idx]) if idx >= 0 else None
+                if idx < 0 or title_code in seen_titles:
+                    continue
+                seen_titles.add(title_code)
+                rows.append(idx)
+                row_scores.append(score)
+                if len(rows) == count:
+                    break
+            # Too many seeds or duplicate titles in the window, widen it
+            if len(rows) == count or fetch_count >= total_movies:
+                break
+            fetch_count = min(total_movies, fetch_count * 2)
+        
+        if not rows:
+            return []
+        
+        neighbors = self._rerank_neighbors(list(zip(rows, row_scores)), weights, num_recommendations, diversity)
+        rows = [idx for idx, _ in neighbors]
+        row_scores = [score for _, score in neighbors]
+        
+        # Closest seed of each result, for the reason text
+        seed_similarity = dot_block(self.item_vectors[rows], self.item_vectors[seeds])
+        closest = seeds[seed_similarity.argmax(axis=1)]
+        reasons = [f"Because you liked {self.catalog.titles[seed]}" for seed in closest]
+        return self.catalog.to_responses(rows, reasons=reasons, similarity_scores=row_scores)
+    
+    def _candidate_count(self, count: int, weights: Dict[str, float], diversity: float = 0.0) -> int:
+        """Candidates to fetch for `count` results (more when they are re-ranked)"""
+        if diversity > 0:
+            return max(count, min(self.neighbor_k, self.mmr_candidates))
+        if self.ranker.is_similarity_only(weights):
+            return count
+        return max(count, min(self.neighbor_k, count * self.ranking_candidate_factor))
+    
+    def _rerank_neighbors(
+        self,
+        neighbors: List[tuple],
+        weights: Dict[str, float],
+        count: int,
+        diversity: float = 0.0
+    ) -> List[tuple]:
+        """
+        Top `count` (index, similarity) pairs ordered by the hybrid score.
+        
+        With diversity > 0 the picks are made by MMR instead, trading relevance
+        for dissimilarity to the movies already picked (e.g. other entries of
+        the same franchise). Only the M x M similarity block of the candidates
+        is computed.
+        """
+        if not neighbors or (diversity <= 0 and self.ranker.is_similarity_only(weights)):
+            return neighbors[:count]
+        rows = np.array([idx for idx, _ in neighbors], dtype=np.int64)
+        similarity = np.array([score for _, score in neighbors], dtype=np.float32)
+        if diversity <= 0:
+            return [neighbors[position] for position in self.ranker.rerank(rows, similarity, weights, count)]
+        
+        block = pairwise_block(self.item_vectors, rows)
+        relevance = self.ranker.score(rows, similarity, weights)
+        return [neighbors[position] for position in mmr_rerank(relevance, block, diversity, count)]
+    
+    def _not_found_response(self, movie_title: str) -> RecommendationResponse:
+        """Response for a title that is not in the catalog"""
+        return RecommendationResponse(
+            should_watch=False,
+            confidence=0.0,
+            reason=f"Movie '{movie_title}' not found in database",
+            recommended_movies=[],
+            target_movie=None
+        )
+    
+    def _build_recommendation(
+        self,
+        movie_idx: int,
+        neighbors: List[tuple],
+        user_preferences: Dict,
+        enhance: bool = True
+    ) -> RecommendationResponse:
+        """Assemble the response for a target movie and its (index, score) neighbours"""
+        # Get the target movie details
+        catalog = self.catalog
+        target_movie = catalog.movie(movie_idx)
+        rows = [idx for idx, _ in neighbors]
+        scores = [score for _, score in neighbors]
+        
+        # Generate reason for each recommendation (vectorised over the candidates)
+        reasons = recommendation_reasons(catalog, movie_idx, rows, scores)
+        recommended_movies = catalog.to_responses(rows, reasons=reasons, similarity_scores=scores)
         
         # Determine if user should watch based on preferences
         should_watch, confidence, reason = self._analyze_preferences(
-            target_movie,
+            movie_idx,
             user_preferences
         )
         # Enhance reason with AI if available
-        if self.ai_service.enabled:
+        if enhance and self.ai_service.enabled:
             reason = self.ai_service.enhance_recommendation_reason(
                 movie_title=target_movie['title'],
                 genres=target_movie['genres'],
@@ -388,23 +1323,30 @@ class RecommendationEngine:
             confidence=confidence,
             reason=reason,
             recommended_movies=recommended_movies,
-            target_movie=MovieResponse(
-                id=int(target_movie['id']),
-                title=target_movie['title'],
-                genres=target_movie['genres'],
-                description=target_movie['description'],
-                rating=float(target_movie['rating']),
-                year=int(target_movie['year']),
-                release_month=int(target_movie['release_month']) if pd.notna(target_movie['release_month']) else None
-            )
+            target_movie=MovieResponse(**target_movie)
         )
     
+    def _genre_overlap(self, movie_idx: int, genres: List[str]) -> tuple:
+        """Genres a movie shares with a genre list, and the list's distinct genre count"""
+        names = split_genres(genres)
+        user_mask = genre_mask(names)
+        overlap = [g.lower() for g in mask_to_genres(int(self.catalog.genre_masks[movie_idx]) & user_mask)]
+        
+        # Names outside the canonical table are compared as plain strings
+        other_genres = {g.lower() for g in names if canonical_genre(g) is None}
+        if other_genres:
+            movie_genres = {g.lower() for g in split_genres(self.catalog.genres(movie_idx))}
+            overlap += sorted(movie_genres & other_genres)
+        
+        return overlap, len(mask_to_genres(user_mask)) + len(other_genres)
+    
     def _analyze_preferences(
         self,
-        movie: pd.Series,
+        movie_idx: int,
         preferences: Dict
     ) -> tuple:
         """Analyze if movie matches user preferences"""
+        movie = self.catalog.movie(movie_idx)
         score = 0
         max_score = 0
         reasons = []
@@ -412,12 +1354,10 @@ class RecommendationEngine:
         # Check genre preferences (weighted lower)
         if 'favorite_genres' in preferences and preferences['favorite_genres']:
             max_score += 30
-            movie_genres = set(movie['genres'].lower().split(', '))
-            user_genres = set(g.lower() for g in preferences['favorite_genres'])
-            genre_overlap = movie_genres.intersection(user_genres)
+            genre_overlap, user_genre_count = self._genre_overlap(movie_idx, preferences['favorite_genres'])
             
             if genre_overlap:
-                genre_score = (len(genre_overlap) / len(user_genres)) * 30
+                genre_score = (len(genre_overlap) / user_genre_count) * 30
                 score += genre_score
                 reasons.append(f"Matches your favorite genres: {', '.join(genre_overlap)}")
             else:
@@ -473,48 +1413,6 @@ class RecommendationEngine:
         
         return should_watch, round(confidence, 2), reason
     
-    def _generate_recommendation_reason(
-        self,
-        target_movie: pd.Series,
-        recommended_movie: pd.Series,
-        similarity_score: float
-    ) -> str:
-        """Generate a personalized reason for why this movie was recommended"""
-        reasons = []
-        
-        # Genre overlap
-        target_genres = set(target_movie['genres'].lower().split(', '))
-        recommended_genres = set(recommended_movie['genres'].lower().split(', '))
-        common_genres = target_genres & recommended_genres
-        
-        if common_genres:
-            genre_list = ', '.join(sorted(common_genres))
-            reasons.append(f"Shares {genre_list} genre{' ' if len(common_genres) == 1 else 's'}")
-        
-        # Similar rating
-        rating_diff = abs(float(target_movie['rating']) - float(recommended_movie['rating']))
-        if rating_diff < 0.5:
-            reasons.append(f"Similar rating ({float(recommended_movie['rating'])}/10)")
-        
-        # Same era
-        target_decade = (int(target_movie['year']) // 10) * 10
-        recommended_decade = (int(recommended_movie['year']) // 10) * 10
-        if target_decade == recommended_decade:
-            reasons.append(f"From the same era ({recommended_decade}s)")
-        
-        # High similarity
-        if similarity_score > 0.7:
-            reasons.append("Very similar content and themes")
-        elif similarity_score > 0.5:
-            reasons.append("Similar storyline and style")
-        
-        if reasons:
-            return " • ".join(reasons)
-        else:
-            return "Recommended based on content similarity"
-    
-
-
     def _generate_movie_database(self) -> List[Dict]:
         """Generate comprehensive movie database using AI"""
         if not self.movie_db_service or not self.movie_db_service.enabled:
@@ -570,6 +1468,7 @@ Generate at least 100 movies to ensure comprehensive search results."""
     def _parse_movie_database(self, text: str) -> List[Dict]:
         """Parse AI-generated movie database"""
         movies = []
+        deduplicator = MovieDeduplicator()
         
         try:
             movie_blocks = text.split('MOVIE ')
@@ -621,7 +1520,8 @@ Generate at least 100 movies to ensure comprehensive search results."""
                     movie.setdefault('rating', 7.0)
                     movie.setdefault('year', 2020)
                     movie.setdefault('release_month', 6)
-                    movies.append(movie)
+                    if not deduplicator.is_duplicate(movie):
+                        movies.append(movie)
             
         except Exception as e:
             print(f"Error parsing movie database: {e}")
@@ -0,0 +1,122 @@
+import re
+import numpy as np
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Sequence
+
+from services.title_index import normalize_title
+
+_TOKEN = re.compile(r'[0-9a-z]+')
+
+DEFAULT_FIELD_WEIGHTS = {'title': 3.0, 'genres': 2.0, 'description': 1.0}
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, accent-free alphanumeric tokens"""
+    return _TOKEN.findall(normalize_title(text))
+
+
+class SearchIndex:
+    """
+    Token inverted index with BM25 ranking over title, genres and description.
+
+    Every term maps to a posting list of sorted int32 document ids and the
+    float32 BM25 contribution of the term to each document (field-weighted term
+    frequency, length-normalized, times IDF). Since those contributions are
+    precomputed, a query only concatenates and sums its posting lists, so its
+    cost scales with posting-list size rather than catalog size.
+
+    Query terms missing from the vocabulary are expanded to every indexed term
+    they prefix, which keeps partial words typed into the search box working.
+    """
+
+    def __init__(
+        self,
+        fields: Dict[str, Sequence[str]],
+        ratings: np.ndarray,
+        field_weights: Optional[Dict[str, float]] = None,
+        k1: float = 1.2,
+        b: float = 0.75,
+        max_expansions: int = 64
+    ):
+        field_weights = field_weights or DEFAULT_FIELD_WEIGHTS
+        self.ratings = np.asarray(ratings, dtype=np.float32)
+        self.max_expansions = max_expansions
+        n_docs = len(self.ratings)
+
+        doc_ids = defaultdict(list)
+        doc_tfs = defaultdict(list)
+        doc_lengths = np.zeros(n_docs, dtype=np.float32)
+
+        for doc in range(n_docs):
+            counts = Counter()
+            for field, weight in field_weights.items():
+                for token in tokenize(fields[field][doc]):
+                    counts[token] += weight
+            doc_lengths[doc] = sum(counts.values())
+            for term, tf in counts.items():
+                doc_ids[term].append(doc)
+                doc_tfs[term].append(tf)
+
+        avg_length = float(doc_lengths.mean()) if n_docs else 1.0
+        length_norm = k1 * (1 - b + b * doc_lengths / max(avg_length, 1e-9))
+
+        self.postings: Dict[str, np.ndarray] = {}
+        self.weights: Dict[str, np.ndarray] = {}
+        for term, docs in doc_ids.items():
+            docs = np.array(docs, dtype=np.int32)
+            tfs = np.array(doc_tfs[term], dtype=np.float32)
+            idf = np.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+            self.postings[term] = docs
+            self.weights[term] = (idf * tfs * (k1 + 1) / (tfs + length_norm[docs])).astype(np.float32)
+
+        self.vocabulary = np.array(sorted(self.postings), dtype=object)
+
+    def _expand(self, term: str) -> List[str]:
+        """The term itself if indexed, otherwise the indexed terms it prefixes"""
+        if term in self.postings:
+            return [term]
+        start = np.searchsorted(self.vocabulary, term, side='left')
+        end = np.searchsorted(self.vocabulary, term + '\uffff', side='left')
+        if end - start > self.max_expansions:
+            # Keep the most common completions
+            candidates = self.vocabulary[start:end]
+            sizes = np.array([len(self.postings[t]) for t in candidates])
+            keep = np.argpartition(-sizes, self.max_expansions - 1)[:self.max_expansions]
+            return list(candidates[keep])
+        return list(self.vocabulary[start:end])
+
+    def search(self, query: str, limit: Optional[int] = None) -> np.ndarray:
+        """
+        Document ids matching every query term, best BM25 score first.
+
+        Ties are broken by rating (highest first). If no document matches all
+        terms, documents matching any term are returned instead.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return np.empty(0, dtype=np.int32)
+
+        doc_lists, weight_lists, term_lists = [], [], []
+        for position, term in enumerate(terms):
+            for expanded in self._expand(term):
+                doc_lists.append(self.postings[expanded])
+                weight_lists.append(self.weights[expanded])
+                term_lists.append(np.full(len(self.postings[expanded]), position, dtype=np.int32))
+
+        if not doc_lists:
+            return np.empty(0, dtype=np.int32)
+
+        docs, inverse = np.unique(np.concatenate(doc_lists), return_inverse=True)
+        scores = np.bincount(inverse, weights=np.concatenate(weight_lists), minlength=len(docs))
+
+        # Number of distinct query terms each document matched
+        pairs = np.unique(inverse.astype(np.int64) * len(terms) + np.concatenate(term_lists))
+        matched = np.bincount(pairs // len(terms), minlength=len(docs))
+        if (matched == len(terms)).any():
+            keep = matched == len(terms)
+            docs, scores = docs[keep], scores[keep]
+
+        order = np.lexsort((-self.ratings[docs], -scores))
+        if limit is not None:
+            order = order[:limit]
+        return docs[order].astype(np.int32)
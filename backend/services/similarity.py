@@ -0,0 +1,229 @@
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Tuple
+
+
+def _merge_top_k(
+    best_idx: np.ndarray,
+    best_scores: np.ndarray,
+    cand_idx: np.ndarray,
+    cand_scores: np.ndarray,
+    k: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Merge a running per-row top-k with a new block of candidates"""
+    idx = np.concatenate([best_idx, cand_idx], axis=1)
+    scores = np.concatenate([best_scores, cand_scores], axis=1)
+    if scores.shape[1] > k:
+        part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        idx = np.take_along_axis(idx, part, axis=1)
+        scores = np.take_along_axis(scores, part, axis=1)
+    return idx, scores
+
+
+def top_k_similar(
+    query,
+    matrix,
+    k: int,
+    chunk_size: int = 4096
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Exact top-k cosine neighbours of each query row against every row of `matrix`.
+
+    Rows are expected to be L2-normalised (the TfidfVectorizer default), so the dot
+    product is the cosine similarity. The catalog is scanned in row chunks of
+    `chunk_size`, so only a (queries x chunk_size) block is ever materialised and
+    memory stays linear in the catalog size. Returns (indices, scores) of shape
+    (queries, k) sorted by descending score; rows are padded with -1 / -inf when
+    the catalog holds fewer than k movies.
+    """
+    n_queries = query.shape[0]
+    n_items = matrix.shape[0]
+
+    best_idx = np.full((n_queries, 0), -1, dtype=np.int32)
+    best_scores = np.full((n_queries, 0), -np.inf, dtype=np.float32)
+
+    if k <= 0 or n_items == 0:
+        return best_idx, best_scores
+
+    for start in range(0, n_items, chunk_size):
+        end = min(start + chunk_size, n_items)
+        block = query @ matrix[start:end].T
+        block = block.toarray() if hasattr(block, 'toarray') else np.asarray(block)
+        block = block.astype(np.float32, copy=False)
+
+        if block.shape[1] > k:
+            part = np.argpartition(-block, k - 1, axis=1)[:, :k]
+            block_scores = np.take_along_axis(block, part, axis=1)
+        else:
+            part = np.broadcast_to(np.arange(block.shape[1]), block.shape)
+            block_scores = block
+
+        best_idx, best_scores = _merge_top_k(
+            best_idx, best_scores,
+            (part + start).astype(np.int32), block_scores,
+            k
+        )
+
+    order = np.argsort(-best_scores, axis=1, kind='stable')
+    best_idx = np.take_along_axis(best_idx, order, axis=1)
+    best_scores = np.take_along_axis(best_scores, order, axis=1)
+
+    if best_idx.shape[1] < k:
+        pad = k - best_idx.shape[1]
+        best_idx = np.pad(best_idx, ((0, 0), (0, pad)), constant_values=-1)
+        best_scores = np.pad(best_scores, ((0, 0), (0, pad)), constant_values=-np.inf)
+
+    return best_idx, best_scores
+
+
+def dedupe_neighbors(
+    row_ids: np.ndarray,
+    indices: np.ndarray,
+    scores: np.ndarray,
+    group_codes: np.ndarray,
+    k: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Drop self matches and repeated titles from score-sorted neighbour lists.
+
+    `group_codes` maps every catalog row to a title group; only the best-scoring
+    row of each group is kept per list, and the query's own group is excluded.
+    The surviving neighbours are compacted to the left and truncated to k, with
+    empty slots marked by -1 / 0.0.
+    """
+    n_rows, width = indices.shape
+    valid = indices >= 0
+    codes = np.where(valid, group_codes[np.maximum(indices, 0)], -1)
+    keep = valid & (codes != group_codes[row_ids][:, None])
+
+    # First occurrence of each (row, group) pair, the lists being sorted best first
+    n_codes = int(group_codes.max()) + 2 if len(group_codes) else 1
+    keys = np.arange(n_rows, dtype=np.int64)[:, None] * n_codes + (codes + 1)
+    _, first = np.unique(keys.ravel(), return_index=True)
+    first_mask = np.zeros(n_rows * width, dtype=bool)
+    first_mask[first] = True
+    keep &= first_mask.reshape(n_rows, width)
+
+    order = np.argsort(~keep, axis=1, kind='stable')[:, :k]
+    kept = np.take_along_axis(keep, order, axis=1)
+    out_idx = np.where(kept, np.take_along_axis(indices, order, axis=1), -1).astype(np.int32)
+    out_scores = np.where(kept, np.take_along_axis(scores, order, axis=1), 0.0).astype(np.float32)
+
+    if out_idx.shape[1] < k:
+        pad = k - out_idx.shape[1]
+        out_idx = np.pad(out_idx, ((0, 0), (0, pad)), constant_values=-1)
+        out_scores = np.pad(out_scores, ((0, 0), (0, pad)), constant_values=0.0)
+
+    return out_idx, out_scores
+
+
+def build_neighbor_table(
+    matrix,
+    k: int,
+    group_codes: np.ndarray,
+    block_size: int = 512,
+    chunk_size: int = 4096,
+    search: Optional[Callable] = None,
+    workers: int = 1,
+    progress: Optional[Callable[[int, int], None]] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Precompute the k nearest distinct-title neighbours of every row.
+
+    Returns int32 neighbour ids and float32 scores of shape (N, k). Each row
+    block over-fetches candidates so that deduplication still leaves k entries.
+    `search(block, fetch)` replaces the exact scan, e.g. with an ANN index query.
+
+    Row blocks are independent and write disjoint slices of the output, so with
+    workers > 1 they run on a thread pool; the sparse and dense products and the
+    partial sorts release the GIL. Peak memory is one (block_size x chunk_size)
+    score block per worker. `progress(done_rows, total_rows)` is called as
+    blocks complete.
+    """
+    n_items = matrix.shape[0]
+    fetch = min(n_items, 2 * k + 1)
+    neighbor_ids = np.full((n_items, k), -1, dtype=np.int32)
+    neighbor_scores = np.zeros((n_items, k), dtype=np.float32)
+
+    def build_block(start: int) -> int:
+        end = min(start + block_size, n_items)
+        if search is not None:
+            indices, scores = search(matrix[start:end], fetch)
+        else:
+            indices, scores = top_k_similar(matrix[start:end], matrix, fetch, chunk_size=chunk_size)
+        neighbor_ids[start:end], neighbor_scores[start:end] = dedupe_neighbors(
+            np.arange(start, end), indices, scores, group_codes, k
+        )
+        return end - start
+
+    starts = range(0, n_items, block_size)
+    done = 0
+    if workers > 1 and len(starts) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for rows in pool.map(build_block, starts):
+                done += rows
+                if progress is not None:
+                    progress(done, n_items)
+    else:
+        for start in starts:
+            done += build_block(start)
+            if progress is not None:
+                progress(done, n_items)
+
+    return neighbor_ids, neighbor_scores
+
+
+def merge_neighbor_candidates(
+    row_ids: np.ndarray,
+    current_ids: np.ndarray,
+    current_scores: np.ndarray,
+    cand_ids: np.ndarray,
+    cand_scores: np.ndarray,
+    group_codes: np.ndarray,
+    k: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Fold new candidate neighbours into existing neighbour lists.
+
+    Used for incremental catalog updates: the current lists of `row_ids` are
+    merged with the candidates, re-sorted and deduplicated down to k entries.
+    """
+    indices = np.concatenate([current_ids, cand_ids.astype(np.int32)], axis=1)
+    scores = np.concatenate([current_scores, cand_scores.astype(np.float32)], axis=1)
+    scores = np.where(indices >= 0, scores, -np.inf)
+
+    order = np.argsort(-scores, axis=1, kind='stable')
+    indices = np.take_along_axis(indices, order, axis=1)
+    scores = np.take_along_axis(scores, order, axis=1)
+
+    return dedupe_neighbors(row_ids, indices, scores, group_codes, k)
+
+
+def pairwise_block(matrix, rows: np.ndarray) -> np.ndarray:
+    """
+    Dense M x M dot-product block between a few rows of a CSR or dense matrix.
+
+    Sparse rows are compacted onto the columns they actually use before a dense
+    product, which for a few dozen rows is much cheaper than a sparse x sparse
+    product and never touches the rest of the matrix.
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    if not hasattr(matrix, 'indptr'):
+        dense = np.asarray(matrix[rows], dtype=np.float32)
+        return dense @ dense.T
+
+    starts, ends = matrix.indptr[rows], matrix.indptr[rows + 1]
+    lengths = ends - starts
+    positions = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+    columns, compact = np.unique(matrix.indices[positions], return_inverse=True)
+
+    dense = np.zeros((len(rows), len(columns)), dtype=np.float32)
+    dense[np.repeat(np.arange(len(rows)), lengths), compact] = matrix.data[positions]
+    return dense @ dense.T
+
+
+def dot_block(left, right) -> np.ndarray:
+    """Dense (rows x rows) dot products between two row sets, sparse or dense"""
+    block = left @ right.T
+    block = block.toarray() if hasattr(block, 'toarray') else np.asarray(block)
+    return block.astype(np.float32, copy=False)
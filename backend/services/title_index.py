@@ -0,0 +1,172 @@
+import re
+import unicodedata
+import numpy as np
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence
+
+_NON_ALNUM = re.compile(r'[^0-9a-z]+')
+_DIGITS = re.compile(r'[0-9]+')
+
+
+def normalize_title(title: str) -> str:
+    """Casefold, strip accents and punctuation, and collapse whitespace"""
+    if not isinstance(title, str):
+        return ''
+    text = unicodedata.normalize('NFKD', title.casefold())
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return _NON_ALNUM.sub(' ', text).strip()
+
+
+def title_key(title: str) -> str:
+    """Exact-match key: the normalized title without any whitespace"""
+    return normalize_title(title).replace(' ', '')
+
+
+def _numbers(key: str) -> str:
+    """Canonical form of the numbers in a key ("toystory4" -> "4")"""
+    return ' '.join(sorted(set(_DIGITS.findall(key))))
+
+
+def _trigrams(key: str) -> List[str]:
+    """Distinct character trigrams of a padded key"""
+    padded = f"  {key} "
+    return list({padded[i:i + 3] for i in range(len(padded) - 2)})
+
+
+class TitleIndex:
+    """
+    O(1) exact title lookup with a character-trigram fuzzy fallback.
+
+    Exact lookups go through a dict keyed on `title_key`, so "Spider-Man" and
+    "spider man" resolve to the same row. Misses are resolved through a trigram
+    inverted index: only rows sharing a trigram with the query are scored, by
+    the fraction of the query's trigrams they contain and then by Dice overlap.
+    This lets "Baahubali 2" resolve to "Baahubali 2: The Conclusion" without a
+    scan over the catalog. Fuzzy matches must carry the same numbers as the
+    query, so "Toy Story 4" never resolves to "Toy Story 2". A title that is
+    itself almost entirely contained in the query must also cover nearly all of
+    the query (`superset_containment`), so a missing "The Dark Knight Rises"
+    is not answered with "The Dark Knight".
+    """
+
+    def __init__(
+        self,
+        titles: Sequence[str],
+        min_containment: float = 0.7,
+        superset_containment: float = 0.9
+    ):
+        self.min_containment = min_containment
+        self.superset_containment = superset_containment
+        self.exact: Dict[str, int] = {}
+        postings = defaultdict(list)
+        gram_counts = np.zeros(len(titles), dtype=np.int32)
+        numbers = np.full(len(titles), '', dtype=object)
+
+        for row, title in enumerate(titles):
+            key = title_key(title)
+            if not key:
+                continue
+            # Keep the first row for duplicate titles, like a top-down scan would
+            self.exact.setdefault(key, row)
+            grams = _trigrams(key)
+            gram_counts[row] = len(grams)
+            numbers[row] = _numbers(key)
+            for gram in grams:
+                postings[gram].append(row)
+
+        self.gram_counts = gram_counts
+        self.numbers = numbers
+        self.postings = {gram: np.array(rows, dtype=np.int32) for gram, rows in postings.items()}
+
+    def lookup(self, title: str, fuzzy: bool = True) -> Optional[int]:
+        """Row of the best matching title, or None"""
+        key = title_key(title)
+        if not key:
+            return None
+        row = self.exact.get(key)
+        if row is not None or not fuzzy:
+            return row
+        return self.fuzzy_lookup(key)
+
+    def fuzzy_lookup(self, key: str) -> Optional[int]:
+        """Best trigram match for a normalized key, or None below the threshold"""
+        grams = _trigrams(key)
+        lists = [self.postings[gram] for gram in grams if gram in self.postings]
+        if not lists:
+            return None
+
+        rows, overlap = np.unique(np.concatenate(lists), return_counts=True)
+        # Sequels and numbered titles only match titles with the same numbers
+        same_numbers = self.numbers[rows] == _numbers(key)
+        if not same_numbers.any():
+            return None
+        rows, overlap = rows[same_numbers], overlap[same_numbers]
+        containment = overlap / len(grams)
+        coverage = overlap / self.gram_counts[rows]
+
+        # A query that extends a shorter title names some other film, so titles
+        # the query covers need a near-complete match in the other direction too
+        required = np.where(coverage >= self.superset_containment, self.superset_containment, self.min_containment)
+        matches = containment >= required
+        if not matches.any():
+            return None
+        rows, overlap, containment = rows[matches], overlap[matches], containment[matches]
+        dice = 2 * overlap / (len(grams) + self.gram_counts[rows])
+
+        # Best containment first, then Dice, then the earliest row
+        order = np.lexsort((rows, -dice, -containment))
+        return int(rows[order[0]])
+
+
+class PrefixIndex:
+    """
+    Sorted-array prefix index for title autocomplete.
+
+    Every normalized title is indexed under its full text and under each word
+    start ("the dark knight", "dark knight", "knight"), so typing any word of a
+    title finds it. A prefix query is two binary searches over the sorted keys;
+    the matching range is ordered by a precomputed per-movie rank, with matches
+    at the start of the title first.
+    """
+
+    def __init__(self, titles: Sequence[str], rank: np.ndarray):
+        keys, rows, starts = [], [], []
+        for row, title in enumerate(titles):
+            words = normalize_title(title).split()
+            for position in range(len(words)):
+                keys.append(' '.join(words[position:]))
+                rows.append(row)
+                starts.append(position == 0)
+
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        self.keys = np.array([keys[i] for i in order], dtype=object)
+        self.rows = np.array([rows[i] for i in order], dtype=np.int32)
+        rank = np.asarray(rank, dtype=np.float32)
+        # Title-start matches outrank any word-start match
+        self.scores = rank[self.rows] + np.array([starts[i] for i in order], dtype=np.float32) * (
+            float(rank.max() - rank.min()) + 1.0 if len(rank) else 1.0
+        )
+
+    def complete(self, prefix: str, limit: int = 10) -> np.ndarray:
+        """Rows of the best-ranked distinct titles starting with the prefix"""
+        prefix = normalize_title(prefix)
+        if not prefix or limit <= 0:
+            return np.empty(0, dtype=np.int32)
+
+        lo = np.searchsorted(self.keys, prefix, side='left')
+        hi = np.searchsorted(self.keys, prefix + '\uffff', side='left')
+        if hi <= lo:
+            return np.empty(0, dtype=np.int32)
+
+        scores = self.scores[lo:hi]
+        rows = self.rows[lo:hi]
+        # A movie can match under several word starts, so over-select before deduplicating
+        take = min(len(scores), limit * 4)
+        if take < len(scores):
+            part = np.argpartition(-scores, take - 1)[:take]
+        else:
+            part = np.arange(len(scores))
+        part = part[np.lexsort((rows[part], -scores[part]))]
+
+        _, first = np.unique(rows[part], return_index=True)
+        return rows[part][np.sort(first)][:limit]
@@ -1,9 +1,11 @@
 import os
 import requests
-from typing import List, Dict
+from typing import List, Dict, Iterator
 import time
 from datetime import datetime, timedelta
 
+from services.genres import TMDB_GENRES
+
 class TMDBDatabaseService:
     """Generate large movie database using TMDB API"""
     
@@ -60,13 +62,29 @@ class TMDBDatabaseService:
     
     def generate_comprehensive_database(self, target_count: int = 3000) -> List[Dict]:
         """Generate comprehensive movie database from TMDB (all time, no date filter)"""
+        all_movies = []
+        for page in self.stream_comprehensive_database(target_count):
+            for movie in page:
+                movie['id'] = len(all_movies) + 1
+                all_movies.append(movie)
+        
+        if self.enabled:
+            print(f"\n✓ Generated {len(all_movies)} unique movies from TMDB in parallel")
+        return all_movies
+    
+    def stream_comprehensive_database(self, target_count: int = 3000) -> Iterator[List[Dict]]:
+        """
+        Stream the comprehensive database page by page as it is fetched.
+        
+        Regions are fetched in parallel; each yielded list holds the movies of
+        one TMDB page that were not seen before (movies keep their TMDB ids).
+        """
         if not self.enabled:
             print("TMDB API not available")
-            return []
+            return
         
         print(f"Starting TMDB comprehensive database generation (target: {target_count} movies)...")
         
-        all_movies = []
         seen_ids = set()
         
         # Define strategies for all-time comprehensive database
@@ -97,53 +115,51 @@ class TMDBDatabaseService:
         threads = []
         
         def fetch_worker(strategy):
+            # Each page goes on the queue as soon as it arrives, None marks the end
             try:
-                movies = self._fetch_movies_by_region(
+                for page in self._iter_movies_by_region(
                     region=strategy['region'],
                     language=strategy['language'],
                     industry=strategy['name'],
                     target=strategy['target'],
                     use_date_filter=False  # NO date filter for comprehensive database
-                )
-                results_queue.put((strategy['name'], movies))
+                ):
+                    results_queue.put((strategy['name'], page))
             except Exception as e:
                 print(f"Error fetching {strategy['name']}: {e}")
-                results_queue.put((strategy['name'], []))
+            finally:
+                results_queue.put((strategy['name'], None))
         
         # Start all threads
         for strategy in strategies:
-            thread = threading.Thread(target=fetch_worker, args=(strategy,))
+            thread = threading.Thread(target=fetch_worker, args=(strategy,), daemon=True)
             thread.start()
             threads.append(thread)
         
-        # Collect results as they complete
+        # Hand pages on as they complete
         completed = 0
+        added_counts = {strategy['name']: 0 for strategy in strategies}
         while completed < len(strategies):
             try:
                 industry_name, movies = results_queue.get(timeout=60)
-                completed += 1
-                
-                # Add unique movies
-                added_count = 0
-                for movie in movies:
-                    if movie['id'] not in seen_ids:
-                        seen_ids.add(movie['id'])
-                        movie['id'] = len(all_movies) + 1
-                        all_movies.append(movie)
-                        added_count += 1
-                
-                print(f"✓ {industry_name}: {added_count} movies (Total: {len(all_movies)})")
-                
             except queue.Empty:
                 print("Timeout waiting for results")
                 break
-        
-        # Wait for all threads to complete
-        for thread in threads:
-            thread.join(timeout=5)
-        
-        print(f"\n✓ Generated {len(all_movies)} unique movies from TMDB in parallel")
-        return all_movies
+            
+            if movies is None:
+                completed += 1
+                print(f"✓ {industry_name}: {added_counts[industry_name]} movies")
+                continue
+            
+            # Add unique movies
+            page = []
+            for movie in movies:
+                if movie['id'] not in seen_ids:
+                    seen_ids.add(movie['id'])
+                    page.append(movie)
+            added_counts[industry_name] += len(page)
+            if page:
+                yield page
     
     def _fetch_parallel(self, strategies: list, use_date_filter: bool, seen_ids: set) -> List[Dict]:
         """Fetch movies in parallel using threading"""
@@ -250,7 +266,15 @@ class TMDBDatabaseService:
     
     def _fetch_movies_by_region(self, region: str, language: str, industry: str, target: int, use_date_filter: bool = False) -> List[Dict]:
         """Fetch movies for specific region and language"""
-        movies = []
+        return [
+            movie
+            for page in self._iter_movies_by_region(region, language, industry, target, use_date_filter)
+            for movie in page
+        ]
+    
+    def _iter_movies_by_region(self, region: str, language: str, industry: str, target: int, use_date_filter: bool = False) -> Iterator[List[Dict]]:
+        """Fetch movies for specific region and language, one TMDB page at a time"""
+        count = 0
         seen_tmdb_ids = set()
         pages_to_fetch = (target // 20) + 2  # TMDB returns ~20 per page
         
@@ -291,6 +315,7 @@ class TMDBDatabaseService:
                 if not results:
                     break
                 
+                movies = []
                 for item in results:
                     tmdb_id = item.get('id')
                     if tmdb_id in seen_tmdb_ids:
@@ -303,8 +328,14 @@ class TMDBDatabaseService:
                     if movie:
                         movies.append(movie)
                     
-                    if len(movies) >= target:
-                        return movies
+                    if count + len(movies) >= target:
+                        break
+                
+                count += len(movies)
+                if movies:
+                    yield movies
+                if count >= target:
+                    return
                 
                 # Rate limiting - faster for parallel requests
                 time.sleep(0.3)  # 3 requests per second per thread
@@ -316,8 +347,6 @@ class TMDBDatabaseService:
             except Exception as e:
                 print(f"  Error fetching page {page}: {e}")
                 break
-        
-        return movies
     
     def _convert_tmdb_movie(self, tmdb_data: Dict, industry: str) -> Dict:
         """Convert TMDB movie data to our format"""
@@ -334,17 +363,9 @@ class TMDBDatabaseService:
                 except:
                     pass
             
-            # Map genre IDs to names
-            genre_map = {
-                28: "Action", 12: "Adventure", 16: "Animation", 35: "Comedy",
-                80: "Crime", 99: "Documentary", 18: "Drama", 10751: "Family",
-                14: "Fantasy", 36: "History", 27: "Horror", 10402: "Music",
-                9648: "Mystery", 10749: "Romance", 878: "Sci-Fi", 10770: "TV Movie",
-                53: "Thriller", 10752: "War", 37: "Western"
-            }
-            
+            # Map genre IDs to canonical names
             genre_ids = tmdb_data.get('genre_ids', [])
-            genres = [genre_map.get(gid, "Drama") for gid in genre_ids[:3]]
+            genres = [TMDB_GENRES.get(gid, "Drama") for gid in genre_ids[:3]]
             genres_str = ", ".join(genres) if genres else "Drama"
             
             # Language mapping
@@ -368,6 +389,8 @@ class TMDBDatabaseService:
                 'genres': genres_str,
                 'description': tmdb_data.get('overview', 'No description available'),
                 'rating': round(tmdb_data.get('vote_average', 7.0), 1),
+                'vote_count': tmdb_data.get('vote_count', 0),
+                'popularity': tmdb_data.get('popularity', 0.0),
                 'industry': industry,
                 'release_month': month,
                 'language': language,
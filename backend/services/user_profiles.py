@@ -0,0 +1,97 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+
+class UserProfileCache:
+    """
+    In-memory LRU cache of per-user profile vectors.
+
+    A profile is the weighted TF-IDF centroid of the movies a user has
+    favorited and watched, so personalised recommendations are a single
+    similarity query. Profiles are built lazily from the Firestore user
+    document, tagged with the model version they were built against, and
+    dropped when the user's favorites or watch history change.
+    """
+
+    def __init__(
+        self,
+        max_users: Optional[int] = None,
+        favorite_weight: Optional[float] = None,
+        history_weight: Optional[float] = None
+    ):
+        self.max_users = max_users or int(os.getenv('USER_PROFILE_CACHE_SIZE', '1000'))
+        self.favorite_weight = favorite_weight or float(os.getenv('USER_PROFILE_FAVORITE_WEIGHT', '2.0'))
+        self.history_weight = history_weight or float(os.getenv('USER_PROFILE_HISTORY_WEIGHT', '1.0'))
+        self._profiles: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def profile_seeds(self, user: Dict, engine) -> Tuple[List[int], List[float]]:
+        """Catalog rows of a user's favorites and watch history with their weights"""
+        weights: Dict[int, float] = {}
+
+        favorite_rows = engine.resolve_seeds(movie_ids=user.get('favorites') or [])
+        for row in favorite_rows:
+            if row is not None:
+                weights[row] = weights.get(row, 0.0) + self.favorite_weight
+
+        for entry in user.get('watchHistory') or []:
+            if not isinstance(entry, dict):
+                continue
+            row = None
+            if entry.get('movieId') is not None:
+                row = engine.resolve_seeds(movie_ids=[entry['movieId']])[0]
+            if row is None and entry.get('title'):
+                row = engine.get_movie_index(entry['title'])
+            if row is not None:
+                weights[row] = weights.get(row, 0.0) + self.history_weight
+
+        return list(weights), list(weights.values())
+
+    def get_profile(self, user_id: str, engine, firebase_service) -> Optional[Dict]:
+        """
+        Cached profile of a user, built on a miss.
+
+        Returns a dict with the profile `vector` (1 x vocabulary CSR row), the
+        `seed_rows` it was built from and the model `version`, or None when the
+        user has no known favorites or watch history.
+        """
+        with self._lock:
+            profile = self._profiles.get(user_id)
+            if profile is not None and profile['version'] == engine.model_version:
+                self._profiles.move_to_end(user_id)
+                return profile
+
+        user = firebase_service.get_user(user_id)
+        if not user:
+            return None
+
+        seed_rows, weights = self.profile_seeds(user, engine)
+        if not seed_rows:
+            return None
+
+        profile = {
+            'vector': engine.seed_centroid(seed_rows, weights),
+            'seed_rows': seed_rows,
+            'version': engine.model_version,
+        }
+        with self._lock:
+            self._profiles[user_id] = profile
+            self._profiles.move_to_end(user_id)
+            while len(self._profiles) > self.max_users:
+                self._profiles.popitem(last=False)
+        return profile
+
+    def invalidate(self, user_id: str):
+        """Drop a user's cached profile after their favorites or history change"""
+        with self._lock:
+            self._profiles.pop(user_id, None)
+
+    def clear(self):
+        """Drop every cached profile"""
+        with self._lock:
+            self._profiles.clear()
+
+    def __len__(self) -> int:
+        return len(self._profiles)
@@ -0,0 +1,59 @@
+import pytest
+
+from services.dedup import MovieDeduplicator, sequel_numbers
+
+DESCRIPTION = "A masked killer terrorizes a group of teenagers in a small town"
+
+
+def movie(title, year, description=DESCRIPTION):
+    return {"title": title, "year": year, "description": description}
+
+
+def is_duplicate_pair(first, second):
+    deduplicator = MovieDeduplicator()
+    assert not deduplicator.is_duplicate(first)
+    return deduplicator.is_duplicate(second)
+
+
+@pytest.mark.parametrize("first, second", [
+    (movie("Scream", 2022), movie("Scream VI", 2023)),
+    (movie("Saw", 2004), movie("Saw II", 2005)),
+    (movie("The Purge", 2013), movie("The Purge: Anarchy", 2014)),
+    (
+        movie("Pirates of the Caribbean: Dead Man's Chest", 2006),
+        movie("Pirates of the Caribbean: At World's End", 2007),
+    ),
+    (movie("Toy Story 3", 2010), movie("Toy Story 4", 2011)),
+    (movie("The Godfather Part II", 1974), movie("The Godfather Part III", 1975)),
+])
+def test_sequels_are_kept(first, second):
+    assert not is_duplicate_pair(first, second)
+
+
+def test_same_title_a_year_apart_is_a_duplicate():
+    tmdb = movie("Inception", 2010, "A thief who steals corporate secrets through dream-sharing technology")
+    llm = movie("Inception", 2011, "Dom Cobb enters dreams to plant an idea in a business heir's mind")
+    assert is_duplicate_pair(tmdb, llm)
+
+
+def test_same_title_without_a_year_is_kept():
+    assert not is_duplicate_pair(movie("Inception", 2010), movie("Inception", None))
+
+
+def test_respelled_title_needs_an_agreeing_description():
+    original = movie("Baahubali: The Beginning", 2015)
+    assert is_duplicate_pair(original, movie("Bahubali: The Beginning", 2015))
+    assert not is_duplicate_pair(
+        original, movie("Bahubali: The Beginning", 2015, "An unrelated plot about a heist in space")
+    )
+
+
+def test_sequel_numbers_cover_roman_numerals_and_words():
+    assert sequel_numbers("saw ii") == sequel_numbers("saw 2") == frozenset({"2"})
+    assert sequel_numbers("the godfather part two") == frozenset({"2"})
+    assert sequel_numbers("the first purge") == frozenset({"1"})
+    assert sequel_numbers("the purge") == frozenset()
+
+
+def test_explicit_zero_threshold_is_kept():
+    assert MovieDeduplicator(threshold=0.0).threshold == 0.0
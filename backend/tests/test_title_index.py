@@ -0,0 +1,47 @@
+from services.title_index import TitleIndex
+
+TITLES = [
+    "Toy Story",
+    "Toy Story 2",
+    "Baahubali: The Beginning",
+    "Baahubali 2: The Conclusion",
+    "Spider-Man",
+    "The Dark Knight",
+    "The Shawshank Redemption",
+]
+
+
+def lookup(index: TitleIndex, query: str):
+    row = index.lookup(query)
+    return None if row is None else TITLES[row]
+
+
+def test_exact_lookup_ignores_case_and_punctuation():
+    index = TitleIndex(TITLES)
+    assert lookup(index, "spider man") == "Spider-Man"
+    assert lookup(index, "TOY STORY 2") == "Toy Story 2"
+
+
+def test_fuzzy_lookup_resolves_partial_titles():
+    index = TitleIndex(TITLES)
+    assert lookup(index, "Baahubali 2") == "Baahubali 2: The Conclusion"
+    assert lookup(index, "Baahubali the begining") == "Baahubali: The Beginning"
+
+
+def test_fuzzy_lookup_rejects_different_sequel_numbers():
+    index = TitleIndex(TITLES)
+    assert lookup(index, "Toy Story 4") is None
+    assert lookup(index, "Baahubali 3") is None
+
+
+def test_fuzzy_lookup_tolerates_typos():
+    index = TitleIndex(TITLES)
+    assert lookup(index, "the dark night") == "The Dark Knight"
+    assert lookup(index, "shawshank redemtion") == "The Shawshank Redemption"
+
+
+def test_fuzzy_lookup_rejects_longer_titles_of_other_films():
+    index = TitleIndex(TITLES)
+    assert lookup(index, "The Dark Knight Rises") is None
+    assert lookup(index, "The Dark Knight Returns") is None
+    assert lookup(index, "Toy Story of Terror") is None
@@ -1,5 +1,13 @@
 import axios from 'axios'
-import type { Movie, RecommendationRequest, RecommendationResponse } from '@/types'
+import type {
+  Movie,
+  RecommendationRequest,
+  RecommendationResponse,
+  BatchRecommendationRequest,
+  BatchRecommendationResponse,
+  MultiSeedRecommendationRequest,
+  MultiSeedRecommendationResponse,
+} from '@/types'
 import { requestCache } from '@/utils/requestCache'
 
 const API_URL = process.env.NEXT_PUBLIC_API_URL || (typeof window !== 'undefined' ? window.location.origin : 'http://localhost:8000')
@@ -36,6 +44,34 @@ export const getMovies = async (limit: number = 100, search?: string): Promise<M
   })
 }
 
+export interface MoviePage {
+  movies: Movie[]
+  nextCursor: string | null
+}
+
+// One page of /api/movies; pass the previous page's nextCursor to continue
+export const getMoviesPage = async (limit: number = 100, search?: string, cursor?: string): Promise<MoviePage> => {
+  const params = new URLSearchParams()
+  params.append('limit', limit.toString())
+  if (search) params.append('search', search)
+  if (cursor) params.append('cursor', cursor)
+  
+  const response = await api.get<Movie[]>(`/api/movies?${params.toString()}`)
+  return { movies: response.data, nextCursor: response.headers['x-next-cursor'] || null }
+}
+
+export const autocompleteMovies = async (query: string, limit: number = 10): Promise<Movie[]> => {
+  const cacheKey = `autocomplete_${limit}_${query.toLowerCase()}`
+  return requestCache.get(cacheKey, async () => {
+    const params = new URLSearchParams()
+    params.append('q', query)
+    params.append('limit', limit.toString())
+    
+    const response = await api.get<Movie[]>(`/api/movies/autocomplete?${params.toString()}`)
+    return response.data
+  })
+}
+
 export const getMovieById = async (id: number): Promise<Movie> => {
   const response = await api.get<Movie>(`/api/movies/${id}`)
   return response.data
@@ -48,6 +84,20 @@ export const getRecommendations = async (
   return response.data
 }
 
+export const getBatchRecommendations = async (
+  request: BatchRecommendationRequest
+): Promise<BatchRecommendationResponse> => {
+  const response = await api.post<BatchRecommendationResponse>('/api/recommend/batch', request)
+  return response.data
+}
+
+export const getMultiSeedRecommendations = async (
+  request: MultiSeedRecommendationRequest
+): Promise<MultiSeedRecommendationResponse> => {
+  const response = await api.post<MultiSeedRecommendationResponse>('/api/recommend/multi', request)
+  return response.data
+}
+
 export const checkHealth = async (): Promise<{ status: string }> => {
   const response = await api.get('/health')
   return response.data
@@ -106,6 +156,16 @@ export const searchMoviesByPreferences = async (preferences: {
   return response.data
 }
 
+export const rankMoviesForPreferences = async (preferences: {
+  favorite_genres?: string[]
+  min_rating?: number
+  preferred_decade?: number
+  limit?: number
+}): Promise<Movie[]> => {
+  const response = await api.post<Movie[]>('/api/movies/ranked-for-preferences', preferences)
+  return response.data
+}
+
 // User recommendation functions
 export const addRecommendation = async (userId: string, movieData: {
   movie_id: number
@@ -124,3 +184,18 @@ export const getUserRecommendations = async (userId: string): Promise<any> => {
   const response = await api.get(`/api/auth/user/${userId}/recommendations`)
   return response.data
 }
+
+export const getFavoritesRecommendations = async (
+  userId: string,
+  limit: number = 10
+): Promise<MultiSeedRecommendationResponse> => {
+  const response = await api.get<MultiSeedRecommendationResponse>(
+    `/api/auth/user/${userId}/favorites/recommendations?limit=${limit}`
+  )
+  return response.data
+}
+
+export const getForYouMovies = async (userId: string, limit: number = 20): Promise<Movie[]> => {
+  const response = await api.get<Movie[]>(`/api/auth/user/${userId}/for-you?limit=${limit}`)
+  return response.data
+}
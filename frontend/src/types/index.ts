@@ -10,6 +10,7 @@ export interface Movie {
   similarity_score?: number
   mass_rating?: number
   cinephile_rating?: number
+  confidence?: number
   poster_url?: string
   backdrop_url?: string
   language?: string
@@ -22,10 +23,19 @@ export interface UserPreferences {
   preferred_decade: number
 }
 
+export interface RankingWeights {
+  similarity?: number
+  rating?: number
+  popularity?: number
+  recency?: number
+}
+
 export interface RecommendationRequest {
   movie_title: string
   user_preferences: UserPreferences
   num_recommendations: number
+  ranking_weights?: RankingWeights
+  diversity?: number
 }
 
 export interface RecommendationResponse {
@@ -35,3 +45,29 @@ export interface RecommendationResponse {
   recommended_movies: Movie[]
   target_movie: Movie | null
 }
+
+export interface BatchRecommendationRequest {
+  movie_titles: string[]
+  user_preferences: UserPreferences
+  num_recommendations: number
+  ranking_weights?: RankingWeights
+  diversity?: number
+}
+
+export interface BatchRecommendationResponse {
+  results: RecommendationResponse[]
+}
+
+export interface MultiSeedRecommendationRequest {
+  movie_titles?: string[]
+  movie_ids?: number[]
+  weights?: number[]
+  num_recommendations?: number
+  ranking_weights?: RankingWeights
+  diversity?: number
+}
+
+export interface MultiSeedRecommendationResponse {
+  seed_movies: Movie[]
+  recommended_movies: Movie[]
+}